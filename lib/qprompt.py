@@ -11,21 +11,42 @@ user input."""
 
 from __future__ import print_function
 
-import copy
-import ctypes
-import random
-import string
+import os
 import sys
-from collections import namedtuple
-from functools import partial
-from getpass import getpass
-from subprocess import call
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict, namedtuple
+from functools import partial, wraps
+from heapq import nlargest
+from itertools import chain, islice
+
+# NOTE: Modules only needed by a few functions (e.g. `ctypes`, `getpass`,
+# `random`, `string`, `subprocess`) are imported where used to keep
+# `import qprompt` fast.
 
 # Handle Python 2/3 differences.
 if sys.version_info >= (3, 0):
+    from _thread import _local as _thread_local
     from io import StringIO
+    _chr = chr
+    _range = range
 else:
+    from thread import _local as _thread_local
     from StringIO import StringIO
+    _chr = unichr
+    _range = xrange
+try:
+    from collections.abc import MutableSequence
+except ImportError:
+    from collections import MutableSequence
+try:
+    from itertools import accumulate as _accumulate
+except ImportError:
+    _accumulate = None
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
 
 ##==============================================================#
 ## SECTION: Global Definitions                                  #
@@ -37,13 +58,54 @@ __version__ = "0.10.0"
 #: A menu entry that can call a function when selected.
 MenuEntry = namedtuple("MenuEntry", "name desc func args krgs")
 
+#: Shared empty `args` of menu entries that have none.
+_NOARGS = ()
+
+#: Marks the empty `krgs` of stored menu entries; never handed out since
+#: entries are read with a fresh dict that callers may change.
+_NOKRGS = {}
+
+#: Magic bytes and header layout of a saved `FileEntries` line offset index;
+#: the header holds the magic bytes, file size, file modification time in
+#: nanoseconds, line count, and the offset array type code plus byte order.
+_IDX_MAGIC = b"QPIDX001"
+_IDX_FORMAT = "<8sQQQ2s6x"
+
+#: Maximum number of words whose posting lists are merged for a short menu
+#: search query; more matching words are found by scanning instead.
+_SEARCH_MERGE = 64
+
+#: Number of closest entries shown for fuzzy menu input by default.
+_FUZZY_COUNT = 10
+
+#: Number of trigram postings counted when ranking fuzzy menu input; the
+#: postings of the most common query trigrams are skipped beyond this once
+#: enough candidates are found.
+_FUZZY_BUDGET = 100000
+
+#: Bytes of a file scanned at a time when building a line offset index.
+_IDX_CHUNK = 1 << 22
+
+#: Prompt machine event; the given text is to be shown.
+Render = namedtuple("Render", "text")
+
+#: Prompt machine event; the console is to be cleared.
+Clear = namedtuple("Clear", "")
+
+#: Prompt machine event; a line of user input is needed for the prompt with
+#: the given message and echo setting.
+Read = namedtuple("Read", "msg shw")
+
+#: Prompt machine event; the final answer.
+Answer = namedtuple("Answer", "value")
+
 #: Prompt start character sequence.
 QSTR = "[?] "
 
 #: User input start character sequence.
 ISTR = ": "
 
-#: Default horizontal rule width.
+#: Default horizontal rule width; narrowed to fit the terminal if needed.
 HRWIDTH = 65
 
 #: Default horizontal rule character.
@@ -55,6 +117,117 @@ TCHAR = "-"
 #: Default bottom wrap character.
 BCHAR = "-"
 
+#: Candidate names of the navigation entries added by `show_limit()`; the
+#: first name that does not clash with an entry on the page is used.
+_NAV_NEXT = ("n", "N", "next", "NEXT", "->", ">>", ">>>")
+_NAV_PREV = ("p", "P", "prev", "PREV", "<-", "<<", "<<<")
+_NAV_FIRST = ("f", "F", "first", "FIRST", "|<")
+_NAV_LAST = ("l", "L", "last", "LAST", ">|")
+_NAV_JUMP = ("g", "G", "goto", "GOTO", "#")
+
+#: ANSI escape sequences used for terminal control.
+_ESC_CLEAR = "\x1b[H\x1b[2J"
+_ESC_CLEAR_LINE = "\r\x1b[2K"
+_ESC_MOVE = "\x1b[%u;%uH"
+_ESC_UP = "\x1b[%uA"
+_ESC_DOWN = "\x1b[%uB"
+_ESC_CLEAR_BELOW = "\x1b[J"
+_ESC_TITLE = "\x1b]0;%s\x07"
+
+#: If true, ANSI escape sequences are used for terminal control; None until
+#: checked by `_use_ansi()`.
+_ansi = None
+
+#: Number of terminal columns; None until detected by `_term_size()`.
+_columns = None
+
+#: Number of terminal lines; detected along with `_columns`.
+_lines = None
+
+#: Seconds that a terminal size detected by `_term_size()` is used for.
+_SIZE_SECS = 1.0
+
+#: Time after which `_term_size()` detects the terminal size again.
+_size_expires = 0
+
+#: Horizontal rules keyed by character and width; see `_rule()`.
+_rules = {}
+
+#: Display widths of the non-ASCII characters seen by `_text_width()`.
+_char_widths = {}
+
+#: Default maximum number of redraws per second of an animated `status()`.
+_STATUS_RATE = 10
+
+#: Frames of the `status()` spinner.
+_SPINNER = "|/-\\"
+
+#: Width of the `status()` progress bar, excluding the brackets.
+_BAR_WIDTH = 20
+
+#: Most seconds that lines of a file streamed by `wrap()` are held back
+#: before being flushed.
+_WRAP_FLUSH_SECS = 0.5
+
+#: Default number of seconds between the plain lines logged by `progress()`
+#: if the output is not a terminal.
+_STATUS_EVERY = 10
+
+#: Long kwarg names accepted for backwards compatibility; the value list of
+#: strings will be renamed to the associated key string.
+_KWARG_FORMATS = {
+    'blk': ["blank"],
+    'dft': ["default"],
+    'hdr': ["header"],
+    'hlp': ["help"],
+    'msg': ["message"],
+    'shw': ["show"],
+    'vld': ["valid"],
+    }
+
+#: Long kwarg names mapped to their short names; built from `_KWARG_FORMATS`.
+_KWARG_ALIASES = dict((v, k) for k in _KWARG_FORMATS for v in _KWARG_FORMATS[k])
+
+#: Kwarg names handled by `_format_kwargs()`; calls without any are passed on
+#: as is.
+_KWARG_HANDLED = frozenset(list(_KWARG_ALIASES) + ['session'])
+
+#: Prompt text shown by `pause()`.
+_PAUSE_TEXT = "Press ENTER to continue..."
+
+#: Input format function that does nothing.
+_nofmt = lambda x: x
+
+#: Answers accepted as yes and no by `ask_yesno()`.
+_YES = ["y", "yes", "Y", "YES"]
+_NO = ["n", "no", "N", "NO"]
+_YESNO = tuple(_YES + _NO)
+
+#: Default valid entries of the typed `ask_X()` functions.
+_VLD_INT = (int,)
+_VLD_FLOAT = (float,)
+_VLD_STR = (str,)
+
+#: Most values of a frozenset validator listed in the help of a prompt.
+_HELP_VALUES = 20
+
+#: Types of the plain values in the `vld` of a prompt; these are never
+#: validators so they skip the checks made by `_validator()`.
+_PLAIN_TYPES = frozenset([str, int, float, type(u"")])
+
+#: Most prompts of the `ask()` and `ask_X()` functions kept for reuse; see
+#: `_prompt()`.
+_PROMPT_CACHE = 128
+
+#: Most valid entries of a prompt that is kept for reuse.
+_PROMPT_CACHE_VLD = 16
+
+#: Types of the valid entries of a prompt that is kept for reuse.
+_PROMPT_CACHE_TYPES = _PLAIN_TYPES | frozenset([type])
+
+#: Prompts of the `ask()` and `ask_X()` functions mapped by their args.
+_prompts = {}
+
 #: User input function.
 _input = input if sys.version_info >= (3, 0) else raw_input
 
@@ -62,6 +235,226 @@ _input = input if sys.version_info >= (3, 0) else raw_input
 ## SECTION: Class Definitions                                   #
 ##==============================================================#
 
+class Writer:
+    """Writes console output for `echo()` and the related display functions;
+    the current writer can be changed with `set_writer()`. Output goes to the
+    given `stream` or to `sys.stdout` if none is given. A frame of output can
+    be collected by using the writer as a context manager; nothing is written
+    until the outermost frame closes, at which point the whole frame is
+    written and flushed at once. Frames are kept per thread so that output
+    of other threads sharing the writer is not held back."""
+    lines = 0 # Number of line breaks written.
+    def __init__(self, stream=None):
+        self.stream = stream
+        self._local = _thread_local() # Open frame and its depth per thread.
+    def __enter__(self):
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if not depth:
+            local.frame = []
+        local.depth = depth + 1
+        return self
+    def __exit__(self, type, value, traceback):
+        local = self._local
+        local.depth -= 1
+        if not local.depth:
+            text = "".join(local.frame)
+            local.frame = None
+            if text:
+                self.write(text)
+    def write(self, text, flush=True):
+        """Writes the given text; buffered if a frame is open in the calling
+        thread."""
+        frame = getattr(self._local, "frame", None)
+        if frame is not None:
+            frame.append(text)
+            return
+        stream = self.stream or sys.stdout
+        stream.write(text)
+        self.lines += text.count("\n")
+        if flush:
+            stream.flush()
+    def read(self, text, func):
+        """Shows the given prompt text and returns the line read by calling
+        `func`, which behaves like `input()`."""
+        if self.stream is None:
+            return func(text)
+        self.write(text)
+        return func("")
+    def _write_now(self, text):
+        """Writes and flushes the given text at once, even if a frame is open;
+        used for output drawn by another thread (see `status()`), which must
+        not end up in a frame of the thread that opened it."""
+        stream = self.stream or sys.stdout
+        stream.write(text)
+        self.lines += text.count("\n")
+        stream.flush()
+
+class NullWriter(Writer):
+    """Writer that discards all output."""
+    def write(self, text, flush=True):
+        pass
+    def _write_now(self, text):
+        pass
+    def read(self, text, func):
+        return func("")
+
+#: Current writer used for all console output.
+_writer = Writer()
+
+class Answers:
+    """Source of scripted user input answers; answers are pulled one at a time
+    as prompts need them so the source is never read further than needed.
+    Can be used as the `input` of a `Session`.
+
+    **Params**:
+      - source (iter|Queue|file) - Source of answers; either an iterable of
+        strings (e.g. a list or generator), a queue whose items are the answers
+        (a None item ends the input) or a file-like object read one line at a
+        time.
+      - timeout (float) - Seconds to wait for each item of a queue before
+        treating the input as exhausted; waits forever if None.
+
+    **Examples**:
+    ::
+        with Session(Answers(["foo", "42"])):
+            name = ask_str()
+            num = ask_int()
+    """
+    def __init__(self, source, timeout=None):
+        #: If true, getting the next answer may block (e.g. waiting on a queue
+        #: or a file descriptor).
+        self.blocking = False
+        if hasattr(source, "put") and hasattr(source, "get"):
+            if sys.version_info >= (3, 0):
+                from queue import Empty
+            else:
+                from Queue import Empty
+            self._next = partial(self._get, source.get, timeout, Empty)
+            self.blocking = True
+        elif hasattr(source, "readline"):
+            self._next = partial(_readline, source.readline)
+            self.blocking = _has_fileno(source)
+        else:
+            self._next = partial(next, iter(source))
+    @staticmethod
+    def _get(get, timeout, empty):
+        try:
+            item = get(timeout=timeout)
+        except empty:
+            raise EOFError
+        if item is None:
+            raise EOFError
+        return item
+    def answer(self):
+        """Returns the next answer. Raises `EOFError` if the source is
+        exhausted."""
+        try:
+            ans = self._next()
+        except StopIteration:
+            raise EOFError
+        return ans if isinstance(ans, str) else "%s" % (ans,)
+
+class Session:
+    """Prompt session with its own input source, output writer and settings.
+    Functions that prompt the user or show menus accept a `session` kwarg;
+    alternatively, a session can be used as a context manager to make it the
+    current session of the calling thread (or asyncio task). Sessions do not
+    modify any process globals so independent sessions can be used from
+    multiple threads at once.
+
+    **Params**:
+      - input (func|file|Answers|iter) - Source of user input; either a
+        function that behaves like `input()`, a file-like object read one line
+        at a time or an `Answers` source. Any other iterable or queue is
+        wrapped in `Answers`. Defaults to the console.
+      - writer (Writer) - Writer used for output. Defaults to the writer set
+        with `set_writer()`.
+      - qstr (str) - Prompt start character sequence; defaults to `QSTR`.
+      - istr (str) - User input start character sequence; defaults to `ISTR`.
+
+    **Examples**:
+    ::
+        session = Session(StringIO("foo\\n42\\n"), Writer(StringIO()))
+        name = ask_str(session=session)
+        with session:
+            num = ask_int()
+    """
+    def __init__(self, input=None, writer=None, qstr=None, istr=None):
+        if not (input is None or hasattr(input, "__call__") or
+                hasattr(input, "readline") or isinstance(input, Answers)):
+            input = Answers(input)
+        self.input = input
+        self.writer = writer
+        self.qstr = qstr
+        self.istr = istr
+        self._last = (None, None, None, None) # Read event, qstr, istr and prompt text last shown.
+    def __enter__(self):
+        _set_sessions(_get_sessions() + (self,))
+        return self
+    def __exit__(self, type, value, traceback):
+        _set_sessions(_get_sessions()[:-1])
+    def out(self):
+        """Returns the writer used for output by this session."""
+        return self.writer or _writer
+    def _echoes(self):
+        """Returns true if lines read by this session are echoed by the
+        terminal, which ends the row of the prompt; scripted answers and
+        input read from files are not."""
+        if self.input is None or hasattr(self.input, "__call__"):
+            return True
+        if isinstance(self.input, Answers):
+            return False
+        try:
+            return self.input.isatty()
+        except (AttributeError, ValueError):
+            return False
+    def read(self, text, shw=True):
+        """Shows the given prompt text then reads and returns a line of user
+        input. Raises `EOFError` if the input source is exhausted."""
+        input = self.input
+        if input is None:
+            return self.out().read(text, _input if shw else _getpass)
+        if isinstance(input, Answers):
+            # Scripted answers are not waited on so the prompt is not flushed.
+            self.out().write(text, False)
+            return input.answer()
+        if hasattr(input, "__call__"):
+            return self.out().read(text, input)
+        self.out().write(text)
+        return _readline(input.readline)
+    def _text(self, read):
+        """Returns the full prompt text for the given `Read` event; the text
+        of the last event is kept until the event or the prompt start and
+        end strings change."""
+        qstr = QSTR if self.qstr is None else self.qstr
+        istr = ISTR if self.istr is None else self.istr
+        last = self._last
+        if last[0] is not read or last[1] is not qstr or last[2] is not istr:
+            last = self._last = (read, qstr, istr, qstr + read.msg + istr)
+        return last[3]
+
+#: Session used when no other session is given or current.
+_default_session = Session()
+
+# The stacks of current sessions and of running animated status lines
+# (innermost last; see `advance()`) are kept in context variables when
+# available so that each thread and each asyncio task has its own; otherwise
+# thread local data is used.
+if ContextVar:
+    _sessions = ContextVar("qprompt_sessions", default=())
+    _get_sessions = _sessions.get
+    _set_sessions = _sessions.set
+    _status_lines = ContextVar("qprompt_status_lines", default=())
+    _get_status_lines = _status_lines.get
+    _set_status_lines = _status_lines.set
+else:
+    _local = _thread_local()
+    _get_sessions = lambda: getattr(_local, "sessions", ())
+    _set_sessions = lambda x: setattr(_local, "sessions", x)
+    _get_status_lines = lambda: getattr(_local, "status_lines", ())
+    _set_status_lines = lambda x: setattr(_local, "status_lines", x)
+
 class StdinSetup:
     """Sets up stdin to be supplied via `setinput()`; a default context manager
     is provided by `stdin_setup`."""
@@ -80,44 +473,1351 @@ class StdinSetup:
 stdin_setup = StdinSetup()
 
 class StdinAuto:
-    """Automatically set stdin using supplied list; a default context manager
-    is provided by `stdin_auto`."""
+    """Automatically supply user input using the given list (defaults to the
+    command line arguments); a default context manager is provided by
+    `stdin_auto`. The answers are pulled one at a time by the prompts of a
+    session entered for the duration of the context, using the writer and
+    settings of the current session."""
     def __init__(self, auto=None):
         self.auto = auto or sys.argv[1:]
+        self._entered = []
     def __enter__(self, auto=None):
+        session = None
         if self.auto:
-            stdin_setup.setup()
-            setinput("\n".join(self.auto))
+            cur = _session()
+            session = Session(Answers(self.auto), cur.writer, cur.qstr, cur.istr)
+            session.__enter__()
+        self._entered.append(session)
     def __exit__(self, type, value, traceback):
-        stdin_setup.teardown()
+        session = self._entered.pop()
+        if session:
+            session.__exit__(type, value, traceback)
 stdin_auto = StdinAuto()
 
+class Interval:
+    """Interval of valid numbers that can be given as (or in) the `vld` of
+    `ask()`, `ask_int()` and `ask_float()`; membership is checked by
+    comparing the bounds so no values are ever generated.
+
+    **Params**:
+      - lo (int|float) - Lower bound; unbounded if None.
+      - hi (int|float) - Upper bound; unbounded if None.
+      - bounds (str) - Whether the bounds are included, as in interval
+        notation: "[]", "[)", "(]" or "()" [default: "[]"].
+
+    **Examples**:
+    ::
+        ask_float("Enter a ratio", vld=Interval(0, 1, "[)"))
+        ask_int("Enter a port", vld=[Interval(1024, 65535), 80])
+    """
+    def __init__(self, lo=None, hi=None, bounds="[]"):
+        if bounds not in ("[]", "[)", "(]", "()"):
+            raise ValueError("Invalid interval bounds: %r" % (bounds,))
+        self.lo = lo
+        self.hi = hi
+        self.bounds = bounds
+    def __contains__(self, x):
+        # Checks are positive so that values comparing false with everything
+        # (e.g. NaN) are rejected.
+        try:
+            if self.lo is not None and not (self.lo < x or (x == self.lo and "[" == self.bounds[0])):
+                return False
+            if self.hi is not None and not (x < self.hi or (x == self.hi and "]" == self.bounds[1])):
+                return False
+            if self.lo is None and self.hi is None and x != x:
+                return False
+        except TypeError:
+            return False
+        return not isinstance(x, (str, bytes, type(u"")))
+    def __str__(self):
+        lo = "-inf" if self.lo is None else self.lo
+        hi = "inf" if self.hi is None else self.hi
+        return "%s%s, %s%s" % (self.bounds[0], lo, hi, self.bounds[1])
+    def __repr__(self):
+        return "Interval(%r, %r, %r)" % (self.lo, self.hi, self.bounds)
+
+class _Valid:
+    """Check made by a validator (an `Interval`, range, frozenset or compiled
+    regex) in the `vld` of a prompt, with the text describing it in the help
+    shown to the user."""
+    def __init__(self, check, text):
+        self.check = check
+        self.text = text
+    def __call__(self, ans):
+        return self.check(ans)
+
+class Prompt:
+    """User input prompt that is prepared once and can then be asked any
+    number of times. The message, default, help text and valid entries are all
+    processed when the prompt is created so that checking each answer only
+    costs a hash lookup plus any supplied type/function checks. The `ask()`
+    function and the typed `ask_X()` functions are built on this class.
+
+    **Params**:
+      - msg (str) - Message to prompt the user with.
+      - fmt (func) - Function used to format user input.
+      - dft (int|float|str) - Default value if input is left blank.
+      - vld ([int|float|str|func]) - Valid input entries. Validators can be
+        given as is or in the list: an `Interval` or range of numbers, a
+        frozenset of formatted values or a compiled regex pattern that must
+        match the whole answer; these are checked without being copied or
+        expanded.
+      - shw (bool) - If true, show the user's input as typed.
+      - blk (bool) - If true, accept a blank string as valid input. Note that
+        supplying a default value will disable accepting blank input.
+      - hlp (str) - Extra notes shown when the user asks for help.
+
+    **Examples**:
+    ::
+        prompt = Prompt("Enter a port", vld=[int])
+        prompt = Prompt("Enter an ID", vld=range(1, 1000000), fmt=int)
+        ports = [prompt.ask() for _ in range(3)]
+    """
+    def __init__(self, msg="Enter input", fmt=None, dft=None, vld=None, shw=True, blk=False, hlp=None):
+        vld = vld or []
+        if not hasattr(vld, "__iter__") or isinstance(vld, (Interval, _range, frozenset)):
+            vld = [vld]
+        if not hasattr(fmt, "__call__"):
+            fmt = _nofmt
+        self.fmt = fmt
+        self.shw = shw
+        self.hlp = hlp or ""
+        body = msg
+        dft = fmt(dft) if dft != None else None # Prevents showing [None] default.
+        extra = set()
+        if dft != None:
+            body += " [%s]" % (dft if type(dft) is str else repr(dft))
+            extra.add(dft)
+            blk = False
+        self.dft = dft
+        self.blk = blk
+        self.body = body
+        items = []
+        checks = []
+        if fmt is _nofmt and (isinstance(vld, (dict, _EntryNames)) or
+                (isinstance(vld, set) and _all_plain(vld))):
+            # Hashed containers are used as is so that large collections of
+            # valid values (e.g. menu entry names) are never copied; sets
+            # holding types or functions are sanitized below.
+            values = vld
+        else:
+            # Sanitize valid inputs; duplicates are dropped but order is kept.
+            # Plain values go into a hashed set while types and functions
+            # become an ordered list of checks; plain values are checked
+            # together at the position of the first one found.
+            values = set()
+            for v in list(vld) + list(extra):
+                if type(v) in _PLAIN_TYPES:
+                    if not values:
+                        checks.append((None, self._isvalue))
+                    values.add(fmt(v) or v)
+                    continue
+                valid = _validator(v)
+                v = valid or fmt(v) or v
+                if valid:
+                    check = (None, valid)
+                elif type(v) is type:
+                    check = (cast, v)
+                elif hasattr(v, "__call__"):
+                    check = (None, v)
+                else:
+                    if not values:
+                        checks.append((None, self._isvalue))
+                    values.add(v)
+                    continue
+                if check not in checks:
+                    checks.append(check)
+                    items.append(v)
+            values = frozenset(values)
+            extra = set()
+        if blk and (values or checks):
+            extra.add("")
+        if (values or extra) and (None, self._isvalue) not in checks:
+            checks.append((None, self._isvalue))
+        self._values = values
+        self._extra = frozenset(extra)
+        self._checks = tuple(checks)
+        self._items = items
+        self._help = None
+        self._machine = None
+    def _isvalue(self, ans):
+        """Returns true if the given answer is one of the valid values."""
+        try:
+            return ans in self._values or ans in self._extra
+        except TypeError:
+            return False
+    def _make_help(self):
+        """Returns the lines displayed when the user asks for help."""
+        lst = [v for v in list(self._values) + list(self._extra) if not (self.blk and "" == v)]
+        # NOTE: The following fixes a Py3 related bug found in `0.8.1`.
+        try: lst = sorted(lst)
+        except: pass
+        for v in self._items:
+            if int == v:
+                lst.append("<int>")
+            elif float == v:
+                lst.append("<float>")
+            elif str == v:
+                lst.append("<str>")
+            elif isinstance(v, _Valid):
+                lst.append(v.text)
+            else:
+                lst.append("(" + v.__name__ + ")")
+        lines = []
+        if lst:
+            lines.append("[HELP] Valid input: %s" % (" | ".join([str(l) for l in lst])))
+        if self.hlp:
+            lines.append("[HELP] Extra notes: " + self.hlp)
+        if self.blk:
+            lines.append("[HELP] Input may be blank.")
+        return lines
+    def help_text(self):
+        """Returns the text showing the valid input and any extra notes for
+        this prompt."""
+        if self._help is None:
+            self._help = "".join([line + "\n" for line in self._make_help()])
+        return self._help
+    def print_help(self):
+        """Shows the valid input and any extra notes for this prompt."""
+        _out().write(self.help_text())
+    def check(self, ans):
+        """Checks the given raw user input. Returns the formatted answer if it
+        is valid, otherwise None."""
+        if "" == ans:
+            if self.dft != None:
+                return self.fmt(self.dft)
+            if not self._isvalue(""):
+                return None
+        try:
+            ans = self.fmt(ans)
+        except:
+            return None
+        if not self._checks:
+            return ans
+        for typ, v in self._checks:
+            if typ:
+                val = typ(ans, v)
+                if val is not None:
+                    return val
+                continue
+            try:
+                if v(ans):
+                    return ans
+            except:
+                pass
+        return None
+    def ask(self, session=None):
+        """Prompts the user until a valid answer is given, then returns it.
+        Input is read using the given `session` or the current session."""
+        return _drive(self.machine(), session)
+    def machine(self):
+        """Returns a `PromptMachine` for this prompt. Prompt machines hold no
+        state between inputs so a single machine is created and reused."""
+        if self._machine is None:
+            self._machine = PromptMachine(self)
+        return self._machine
+    def ask_async(self, session=None):
+        """Returns a coroutine that prompts the user like `ask()` without
+        blocking the asyncio event loop; see the `qprompt_async` module."""
+        import qprompt_async
+        return qprompt_async.ask_prompt(self, session)
+
+class PromptMachine:
+    """Sans-IO state machine for asking a `Prompt`. The machine performs no
+    input or output itself; `start()` and `feed()` return lists of events
+    (`Render`, `Clear`, `Read` and `Answer`) that a driver acts on. Each
+    list ends with a single `Read` or `Answer` event, optionally preceded by
+    `Render` and `Clear` events. The driver supplies each line of user input
+    requested by a `Read` event to `feed()` until an `Answer` event is
+    returned.
+
+    **Examples**:
+    ::
+        machine = PromptMachine(Prompt(vld=[int]))
+        machine.start()    # [Read(msg='Enter input', shw=True)]
+        machine.feed("?")  # [Render(text='[HELP] ...'), Read(...)]
+        machine.feed("3")  # [Answer(value=3)]
+    """
+    def __init__(self, prompt):
+        self.prompt = prompt
+        self._read = Read(prompt.body, prompt.shw)
+    def start(self):
+        """Returns the events that start the prompt."""
+        return [self._read]
+    def feed(self, line):
+        """Returns the events caused by the given line of user input."""
+        if "?" == line:
+            return [Render(self.prompt.help_text()), self._read]
+        ans = self.prompt.check(line)
+        if ans is None:
+            return [self._read]
+        return [Answer(ans)]
+
+class MenuMachine:
+    """Sans-IO state machine for showing a menu of `MenuEntry` items; see
+    `PromptMachine` for how it is driven. Accepts the same kwargs as
+    `show_menu()`; if `limit` is set, the menu is paged like `show_limit()`
+    and can be searched. If `fuzzy` is set, input that is not an entry name
+    shows the closest entries instead. If `redraw` is set, each new page is
+    painted over the previous one by the `painter`, which the driver supplies
+    with the writer and terminal settings (see `_Painter`). The `Answer`
+    event holds the selected entry; running the entry function is left to
+    the driver."""
+    def __init__(self, entries, **kwargs):
+        self.entries = entries
+        self.view = entries # Entries being paged; narrowed by a search.
+        self.query = None # Current search query, if any.
+        self.ranked = False # True if the view holds fuzzy matches.
+        self.missed = None # Fuzzy query with no close matches, until shown.
+        self.kwargs = kwargs
+        self.limit = kwargs.get('limit') or 0
+        dft = kwargs.get('dft', None)
+        if type(dft) == int:
+            dft = str(dft)
+        self.dft = dft
+        self.ipage = 0 # Index of current page.
+        self.index = {} # Entry names mapped to entries for the shown menu.
+        self._nav = {} # Navigation entry names mapped to the page they show.
+        self._njump = None # Name of 'go to page' entry.
+        self._jump = None # Prompt machine for a page number, if being asked.
+        self._select = None # Prompt machine for a menu selection.
+        self._search = None # Search index, if not cached on the entries.
+        redraw = kwargs.get('redraw')
+        if redraw and not isinstance(redraw, _Painter):
+            redraw = _Painter()
+        self.painter = redraw or None # Painter of redrawn frames, if any.
+    def npages(self):
+        """Returns the number of pages of the menu; a lazy entry source is
+        pulled to the end."""
+        if self.limit <= 0:
+            return 1
+        return (_count(self.view) + self.limit - 1) // self.limit
+    def start(self):
+        """Returns the events that show the menu."""
+        return self._show()
+    def _show(self):
+        """Returns the events that show the current page of the menu."""
+        kwargs = self.kwargs
+        if self.limit > 0:
+            # Only the entries up to the start of the next page are needed;
+            # a negative page index selects the last page.
+            if self.ipage < 0:
+                self.ipage = self.npages() - 1
+            total = _count(self.view, (self.ipage + 1) * self.limit + 1)
+            self.ipage = max(0, min(self.ipage, (total + self.limit - 1) // self.limit - 1))
+            page, self._nav, self._njump, dft = _limit_page(self.view, self.ipage, self.limit, self.dft)
+            entries = page
+            self.index = page.index
+        else:
+            entries = self.view
+            self.index = kwargs.get('index')
+            if self.index is None:
+                self.index = getattr(self.entries, "names", None)
+            if self.index is None:
+                self.index = {}
+                for i in self.entries:
+                    self.index.setdefault(i.name, i)
+            dft = self.dft if self.dft in self.index else None
+        events = []
+        if kwargs.get('clear'):
+            events.append(Clear())
+        if not kwargs.get('compact', False):
+            events.append(Render(self._banner(entries, kwargs.get('hdr', ""))))
+        if kwargs.get('note'):
+            events.append(Render("[!] %s\n" % (kwargs['note'])))
+        if self.missed is not None:
+            events.append(Render("[!] No close matches to `%s`.\n" % (self.missed)))
+            self.missed = None
+        if self.query is not None and self.ranked:
+            events.append(Render("[!] Closest matches to `%s`; enter `/` to show all.\n" % (self.query)))
+        elif self.query is not None and self.view.pending:
+            events.append(Render("[!] Showing entries matching `%s`; enter `/` to show all.\n" % (self.query)))
+        elif self.query is not None:
+            events.append(Render("[!] %u entries match `%s`; enter `/` to show all.\n" % (len(self.view), self.query)))
+        if self.painter:
+            events = self.painter.paint(events)
+        msg = kwargs.get('msg', "Enter menu selection")
+        self._select = Prompt(msg, vld=self.index, dft=dft).machine()
+        return events + self._select.start()
+    def _banner(self, entries, hdr):
+        """Returns the banner text showing the given entries. The banner of
+        the whole menu is kept in the `frames` dict, if given, until the
+        entries or header change; only `MenuEntries` and `FileEntries` are
+        cached since changes to other lists cannot be seen."""
+        frames = self.kwargs.get('frames')
+        if frames is None or entries is not self.entries or not hasattr(entries, "_changes"):
+            return _menu_banner(entries, hdr)
+        key = (id(entries), hdr, _count(entries), entries._changes)
+        cached = frames.get(key)
+        if cached is None or cached[0] is not entries:
+            frames.clear()
+            cached = frames[key] = (entries, _menu_banner(entries, hdr))
+        return cached[1]
+    def feed(self, line):
+        """Returns the events caused by the given line of user input."""
+        if not self.painter:
+            return self._feed(line)
+        events = self._feed(line)
+        self.painter.track(events)
+        return events
+    def _feed(self, line):
+        if self._jump:
+            events = self._jump.feed(line)
+            if type(events[-1]) is Answer:
+                self._jump = None
+                self.ipage = events[-1].value - 1
+                return self._show()
+            return events
+        if (self.limit > 0 or self.query is not None) and line.startswith("/") and line not in self.index:
+            return self.search(line[1:])
+        if self.kwargs.get('fuzzy') and line.strip() and "?" != line and line not in self.index:
+            if self._select.prompt.check(line) is None:
+                return self.rank(line)
+        events = self._select.feed(line)
+        if type(events[-1]) is not Answer:
+            return events
+        name = events[-1].value
+        if name == self._njump:
+            vld = _page_check(self.view, self.limit)
+            self._jump = Prompt("Enter page number", vld=vld, fmt=_fmt_int).machine()
+            return self._jump.start()
+        if name in self._nav:
+            self.ipage = self._nav[name]
+            return self._show()
+        if name not in self.index:
+            # Any answer passes a prompt with no valid values, e.g. on the
+            # empty page of a search with no matches.
+            return self._select.start()
+        return [Answer(self.index[name])]
+    def search(self, query):
+        """Narrows the paged entries to those matching the given query (see
+        `_SearchIndex`) and returns the events that show the first page; an
+        empty query shows all entries again."""
+        query = query.strip()
+        self.ipage = 0
+        self.ranked = False
+        if not query:
+            self.view = self.entries
+            self.query = None
+            return self._show()
+        self.view = _Subset(self.entries, self._index().find(query))
+        self.query = query
+        return self._show()
+    def rank(self, query):
+        """Narrows the entries to those closest to the given query (see
+        `_SearchIndex.rank()`), best first, and returns the events that show
+        them."""
+        fuzzy = self.kwargs.get('fuzzy')
+        count = _FUZZY_COUNT if fuzzy is True else int(fuzzy)
+        query = query.strip()
+        found = self._index().rank(query, count)
+        self.ipage = 0
+        if not found:
+            # All entries are kept in view rather than showing an empty page.
+            self.view = self.entries
+            self.query = None
+            self.ranked = False
+            self.missed = query
+            return self._show()
+        self.view = _Subset(self.entries, _Positions(found))
+        self.query = query
+        self.ranked = True
+        return self._show()
+    def _index(self):
+        """Returns the search index of the entries, building it if the entries
+        changed since it was built."""
+        entries = self.entries
+        key = (_count(entries), getattr(entries, "_changes", 0))
+        index = getattr(entries, "_search", None) or self._search
+        if index is None or index.key != key:
+            index = (_ScanIndex if isinstance(entries, FileEntries) else _SearchIndex)(entries)
+            index.key = key
+            if hasattr(entries, "_search"):
+                entries._search = index
+            self._search = index
+        return index
+
+class _Painter:
+    """Tracks the lines of the menu frame last painted on the console so that
+    the next frame only rewrites the lines that changed, using ANSI cursor
+    movement; the bytes sent per input are then proportional to the change
+    rather than to the menu size. The cursor position is tracked by counting
+    the rows written below the frame (input lines, help and any output
+    written through the session writer between menus); lines longer than
+    the terminal width count as the rows they wrap to. Output written around
+    the writer (e.g. `print()`) is not seen, in which case the frame should
+    be painted fresh by using a new painter. A `Menu` keeps one painter so
+    that `main(loop=True)` redraws in place.
+
+    The painter performs no output itself; the driver supplies the writer and
+    the terminal settings with `resume()` and reports each prompt and line of
+    input that was echoed to the terminal with `echoed()`. Frames are painted
+    in full until `resume()` is called."""
+    def __init__(self):
+        self.lines = None # Lines of the painted frame; None if not painted.
+        self.rows = None # Terminal rows taken by each painted line.
+        self.width = None # Terminal width when the frame was painted.
+        self.below = 0 # Rows written below the frame since it was painted.
+        self.writer = None # Writer of the painted frame.
+        self.mark = 0 # Line count of the writer when the menu was left.
+        self.columns = HRWIDTH # Current terminal width.
+        self.height = None # Current terminal height; None if unknown.
+        self.ansi = False # If true, ANSI cursor movement may be used.
+        self._text = None # Text of the last Render event returned.
+    def resume(self, writer, columns, ansi, height=None):
+        """Accounts for the lines written by the given writer since the
+        painted frame was left; a different writer starts a new frame. The
+        terminal size and ANSI support apply to the following frames."""
+        if writer is not self.writer:
+            self.lines = None
+            self.writer = writer
+        elif self.lines is not None:
+            self.below += getattr(writer, "lines", 0) - self.mark
+        self.columns = columns
+        self.height = height
+        self.ansi = ansi
+    def echoed(self, text):
+        """Counts the rows taken by the given prompt and line of input echoed
+        to the terminal; the echoed line break ends the last row."""
+        self.below += sum(self._rows(text.split("\n")))
+    def track(self, events):
+        """Counts the lines rendered below the frame by the given events."""
+        for event in events:
+            if type(event) is Render and event.text is not self._text:
+                self.below += sum(self._rows(event.text.split("\n")[:-1]))
+        self.mark = getattr(self.writer, "lines", 0)
+    def paint(self, events):
+        """Returns the given frame events (see `MenuMachine`) replaced by the
+        events that paint them over the previous frame."""
+        text = "".join([e.text for e in events if type(e) is Render])
+        lines = text.split("\n")[:-1]
+        old, oldrows, width = self.lines, self.rows, self.width
+        self.width = self.columns
+        self.lines = lines
+        self.rows = rows = self._rows(lines)
+        up = 0 if old is None else sum(oldrows) + self.below
+        # The cursor cannot move above the top row, so a previous frame that
+        # scrolled partly off the terminal is painted again in full.
+        if old is None or width != self.width or not self.ansi or \
+                (self.height and up >= self.height):
+            self.below = 0
+            self._text = text
+            return [e for e in events if type(e) is not Render] + [Render(text)]
+        self.below = 0
+        out = ["\r"]
+        if up:
+            out.append(_ESC_UP % (up))
+        skip = 0
+        shifted = False # True once lines are no longer on their old rows.
+        for i, line in enumerate(lines):
+            if not shifted and i < len(old) and old[i] == line:
+                skip += rows[i]
+                continue
+            if skip:
+                out.append(_ESC_DOWN % (skip))
+                skip = 0
+            # Clear the end of the last row of a wrapped line too.
+            out.append(_ESC_CLEAR_LINE + line + ("\x1b[K\n" if rows[i] > 1 else "\n"))
+            shifted = shifted or i >= len(old) or rows[i] != oldrows[i]
+        if skip:
+            out.append(_ESC_DOWN % (skip))
+        out.append(_ESC_CLEAR_BELOW)
+        self._text = "".join(out)
+        return [Render(self._text)]
+    def _rows(self, lines):
+        """Returns the terminal rows taken by each of the given lines."""
+        width = self.columns
+        return [max(1, (len(line) + width - 1) // width) for line in lines]
+
+class _MenuPage:
+    """View of a single page of menu entries as shown by `show_limit()`. The
+    entries are read in place from the underlying sequence; only the extra
+    navigation entries and a name index of the page are stored."""
+    def __init__(self, entries, start, stop):
+        self.entries = entries
+        self.start = start
+        self.stop = stop
+        self.extra = []
+        self.index = {}
+        for entry in self:
+            self.index.setdefault(entry.name, entry)
+    def __len__(self):
+        return self.stop - self.start + len(self.extra)
+    def __iter__(self):
+        entries = self.entries
+        for i in range(self.start, self.stop):
+            yield entries[i]
+        for entry in self.extra:
+            yield entry
+
+class MenuEntries(MutableSequence):
+    """Compact list of `MenuEntry` items; used as the `entries` of a `Menu`.
+    Items are read and written as `MenuEntry` tuples like a normal list but
+    are stored as columns of fields. The function and argument columns are
+    only created once an entry uses them (entries without arguments store the
+    empty `_NOARGS` and `_NOKRGS` values) and the names of enumerated entries
+    (`1`, `2`, ...) are generated when read. Entries are indexed by name; see
+    `names` and `find()`.
+
+    Entries may come from a lazy source; if the given `entries` iterable has
+    no length (e.g. a generator or database cursor) or entries are added with
+    `enum_from()`, items are only pulled from it as entries are needed. Paging
+    with `show_limit()` only pulls up to the start of the next page, while
+    taking the length or adding entries pulls the whole source.
+
+    Like a list, entries support slice assignment, `sort()` and `copy()` and
+    compare equal to a list of the same entries."""
+    def __init__(self, entries=()):
+        self._lazy = 0 # Number of leading entries with enumerated names.
+        self._names = [] # Names of the entries after the enumerated ones.
+        self._descs = []
+        self._funcs = None # Optional columns; None while all values are empty.
+        self._args = None
+        self._krgs = None
+        self._first = {} # Stored names mapped to the position of first use.
+        self._source = None # Iterator of entries not pulled yet.
+        self._numbered = True # If true, the source only has enumerated entries.
+        self._changes = 0 # Number of changes other than appends.
+        self._search = None # Cached search index; see `MenuMachine.search()`.
+        #: Mapping of entry names to entries; if names are duplicated, the
+        #: first entry is used.
+        self.names = _EntryNames(self)
+        if hasattr(entries, "__len__"):
+            for entry in entries:
+                self.append(entry)
+        else:
+            self._extend_from(entries, False)
+    def __len__(self):
+        return self.fetch()
+    def __iter__(self):
+        i = 0
+        while i < len(self._descs) or (self._source and self.fetch(i + 1) > i):
+            yield self._entry(i)
+            i += 1
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._entry(x) for x in range(*i.indices(len(self)))]
+        return self._entry(self._pos(i))
+    def __setitem__(self, i, entry):
+        if isinstance(i, slice):
+            return self._set_slice(i, list(entry))
+        i = self._pos(i)
+        name, desc, func, args, krgs = entry
+        reindex = name != self._name(i)
+        if reindex:
+            if i < self._lazy:
+                self._unlazy(i)
+            self._names[i - self._lazy] = name
+        self._descs[i] = desc
+        self._put(i, func, args, krgs)
+        self._changes += 1
+        if reindex:
+            self._reindex()
+    def __delitem__(self, i):
+        if isinstance(i, slice):
+            for x in sorted(range(*i.indices(len(self))), reverse=True):
+                del self[x]
+            return
+        self.fetch()
+        i = self._pos(i)
+        name = self._name(i)
+        if i < self._lazy:
+            self._unlazy(i + 1)
+            self._lazy -= 1
+        else:
+            del self._names[i - self._lazy]
+        del self._descs[i]
+        for col in (self._funcs, self._args, self._krgs):
+            if col is not None:
+                del col[i]
+        self._changes += 1
+        if i < len(self._descs):
+            self._reindex()
+        elif self._first.get(name) == i:
+            del self._first[name]
+    def __eq__(self, other):
+        if not isinstance(other, (list, MutableSequence)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+    __hash__ = None
+    def insert(self, i, entry):
+        """Inserts the given entry before position `i`."""
+        n = self.fetch()
+        i = max(0, min(n, i + n if i < 0 else i))
+        if i == n:
+            return self.append(entry)
+        name, desc, func, args, krgs = entry
+        if i < self._lazy:
+            self._unlazy(i)
+        self._names.insert(i - self._lazy, name)
+        self._descs.insert(i, desc)
+        self._put(i, func, args, krgs, True)
+        self._changes += 1
+        self._reindex()
+    def append(self, entry):
+        """Appends the given entry."""
+        self.fetch()
+        self._append(*entry)
+    def add(self, name, desc, func=None, args=None, krgs=None):
+        """Appends an entry with the given fields."""
+        self.fetch()
+        self._append(name, desc, func, args or _NOARGS, krgs or _NOKRGS)
+    def enum(self, desc, func=None, args=None, krgs=None):
+        """Appends an entry named by its position, starting from `1`."""
+        self.fetch()
+        self._append(None, desc, func, args or _NOARGS, krgs or _NOKRGS)
+    def enum_from(self, strs):
+        """Appends entries named by position like `enum()` for each of the
+        given entry descriptions; the iterable is pulled lazily."""
+        self._extend_from(((None, desc, None, _NOARGS, _NOKRGS) for desc in strs), True)
+    def sort(self, key=None, reverse=False):
+        """Sorts the entries in place like `list.sort()`."""
+        entries = sorted(self, key=key, reverse=reverse)
+        self._clear()
+        for entry in entries:
+            self._append(*entry)
+        self._changes += 1
+    def copy(self):
+        """Returns a shallow copy of the entries."""
+        return MenuEntries(self)
+    @property
+    def pending(self):
+        """True if the lazy entry source has not been pulled to the end."""
+        return self._source is not None
+    def fetch(self, count=None):
+        """Pulls entries from the lazy source until at least `count` entries
+        are available, or to the end if None. Returns the number of entries
+        available."""
+        source = self._source
+        while source is not None and (count is None or len(self._descs) < count):
+            try:
+                entry = next(source)
+            except StopIteration:
+                self._source = None
+                break
+            self._append(*entry)
+        return len(self._descs)
+    def find(self, name):
+        """Returns the position of the first entry with the given `name` or -1
+        if not found."""
+        if self._source is not None:
+            self._fetch_name(name)
+        if self._lazy:
+            try:
+                i = int(name) - 1
+                if 0 <= i < self._lazy and str(i + 1) == name:
+                    return i
+            except (TypeError, ValueError):
+                pass
+        return self._first.get(name, -1)
+    def _iter_names(self):
+        """Yields the distinct entry names in order of first use."""
+        self.fetch()
+        for i in range(self._lazy):
+            yield str(i + 1)
+        for name in list(self._first):
+            if self.find(name) >= self._lazy:
+                yield name
+    def _fetch_name(self, name):
+        """Pulls the lazy source far enough to find the given name."""
+        if not self._numbered:
+            self.fetch()
+            return
+        try:
+            num = int(name)
+        except (TypeError, ValueError):
+            return
+        if num > 0 and str(num) == name:
+            self.fetch(num)
+    def _extend_from(self, entries, numbered):
+        """Adds the given iterable of entries as a lazy source; if `numbered`
+        is true, the entries are all named by position."""
+        if self._source is None:
+            self._source = iter(entries)
+            self._numbered = numbered
+        else:
+            self._source = chain(self._source, entries)
+            self._numbered = self._numbered and numbered
+    def _pos(self, i):
+        """Returns the non-negative position for the given list index."""
+        if self._source is not None and (i < 0 or i >= len(self._descs)):
+            self.fetch(None if i < 0 else i + 1)
+        n = len(self._descs)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("menu entry index out of range")
+        return i
+    def _name(self, i):
+        """Returns the name of the entry at the given position."""
+        if i < self._lazy:
+            return str(i + 1)
+        return self._names[i - self._lazy]
+    def _entry(self, i):
+        """Returns the entry at the given position."""
+        krgs = self._krgs[i] if self._krgs else _NOKRGS
+        return MenuEntry(
+                self._name(i),
+                self._descs[i],
+                self._funcs[i] if self._funcs else None,
+                self._args[i] if self._args else _NOARGS,
+                {} if krgs is _NOKRGS else krgs)
+    def _append(self, name, desc, func, args, krgs):
+        """Appends an entry; a `name` of None names the entry by position."""
+        n = len(self._descs)
+        if n == self._lazy and (name is None or name == str(n + 1)):
+            self._lazy += 1
+        else:
+            if name is None:
+                name = str(n + 1)
+            self._names.append(name)
+            self._first.setdefault(name, n)
+        self._descs.append(desc)
+        if type(krgs) is dict and not krgs:
+            krgs = _NOKRGS
+        if func is None and args is _NOARGS and krgs is _NOKRGS and \
+                self._funcs is None and self._args is None and self._krgs is None:
+            return
+        self._put(n, func, args, krgs, True)
+    def _put(self, i, func, args, krgs, insert=False):
+        """Stores the optional fields of the entry at the given position; if
+        `insert` is true, the entry is new and its description is already
+        stored."""
+        if type(krgs) is dict and not krgs:
+            krgs = _NOKRGS
+        for attr, value, empty in (("_funcs", func, None), ("_args", args, _NOARGS), ("_krgs", krgs, _NOKRGS)):
+            col = getattr(self, attr)
+            if col is None:
+                if value is empty:
+                    continue
+                col = [empty] * (len(self._descs) - 1 if insert else len(self._descs))
+                setattr(self, attr, col)
+            if insert:
+                col.insert(i, value)
+            else:
+                col[i] = value
+    def _set_slice(self, s, entries):
+        """Replaces the entries in the given slice like a list does."""
+        start, stop, step = s.indices(len(self))
+        if step != 1:
+            positions = _range(start, stop, step)
+            if len(positions) != len(entries):
+                raise ValueError("attempt to assign sequence of size %u to extended slice of size %u" % (
+                    len(entries), len(positions)))
+            for i, entry in zip(positions, entries):
+                self[i] = entry
+            return
+        del self[start:max(start, stop)]
+        for i, entry in enumerate(entries, start):
+            self.insert(i, entry)
+    def _clear(self):
+        """Removes all stored entries; the lazy source is kept."""
+        self._lazy = 0
+        self._names = []
+        self._descs = []
+        self._funcs = None
+        self._args = None
+        self._krgs = None
+        self._first = {}
+    def _unlazy(self, i):
+        """Stores the names of the enumerated entries from position `i` on so
+        that the entries can be moved or renamed; the caller must reindex."""
+        if i < self._lazy:
+            self._names[0:0] = [str(x + 1) for x in range(i, self._lazy)]
+            self._lazy = i
+    def _reindex(self):
+        """Rebuilds the index of stored names."""
+        self._first = {}
+        for i, name in enumerate(self._names, self._lazy):
+            self._first.setdefault(name, i)
+
+class _EntryNames:
+    """Read-only mapping of entry names to the entries of a `MenuEntries` or
+    `FileEntries`; no names are stored for enumerated entries."""
+    def __init__(self, entries):
+        self._entries = entries
+    def __contains__(self, name):
+        return self._entries.find(name) >= 0
+    def __getitem__(self, name):
+        i = self._entries.find(name)
+        if i < 0:
+            raise KeyError(name)
+        return self._entries._entry(i)
+    def get(self, name, default=None):
+        i = self._entries.find(name)
+        return default if i < 0 else self._entries._entry(i)
+    def __iter__(self):
+        return self._entries._iter_names()
+    def __len__(self):
+        return sum(1 for _ in self)
+    def __bool__(self):
+        return self._entries.fetch(1) > 0
+    __nonzero__ = __bool__
+
+class FileEntries(MutableSequence):
+    """List of `MenuEntry` items for the lines of a text file; each line is
+    an entry named by its line number (`1`, `2`, ...) with the line as its
+    description. The file is memory-mapped and lines are only read when their
+    entry is used, so only the line offset index is held in memory. The index
+    is saved to `idxpath` (defaults to the file path plus `.qpidx`) and reused
+    while the file size and modification time are unchanged; a saved index is
+    also memory-mapped. Entries may be appended after the lines (e.g. a quit
+    entry) but the lines themselves are read-only.
+
+    **Params**:
+      - path (str) - Path of the text file.
+      - idxpath (str) - Path of the saved line offset index; if it cannot be
+        written, the index is only kept in memory.
+      - encoding (str) - Encoding of the file.
+
+    **Examples**:
+    ::
+        menu = Menu(FileEntries("hosts.txt"))
+        host = menu.show(limit=20, returns="desc")
+    """
+    def __init__(self, path, idxpath=None, encoding="utf-8"):
+        import mmap
+        self.path = path
+        self.idxpath = idxpath or path + ".qpidx"
+        self.encoding = encoding
+        #: Entries appended after the lines of the file.
+        self.extra = MenuEntries()
+        #: Mapping of entry names to entries; see `MenuEntries.names`.
+        self.names = _EntryNames(self)
+        self._search = None # Cached search index; see `MenuMachine.search()`.
+        self._file = open(path, "rb")
+        self._map = b""
+        self._idxmap = None
+        stat = os.fstat(self._file.fileno())
+        self._size = stat.st_size
+        if self._size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        key = (self._size, getattr(stat, "st_mtime_ns", int(stat.st_mtime * 1e9)))
+        self._offsets = self._load_index(key)
+        if self._offsets is None:
+            self._offsets = _line_offsets(self._map, self._size)
+            self._save_index(key)
+        self._nlines = len(self._offsets)
+        # Position after the content of the last line.
+        self._end = self._size
+        if self._size and self._map[self._size-1:self._size] == b"\n":
+            self._end -= 1
+    def close(self):
+        """Closes the file and the saved index."""
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        for obj in (self._idxmap, self._map, self._file):
+            if hasattr(obj, "close"):
+                obj.close()
+    def __enter__(self):
+        return self
+    def __exit__(self, type, value, traceback):
+        self.close()
+    def __len__(self):
+        return self._nlines + len(self.extra)
+    def __iter__(self):
+        for i in range(self._nlines):
+            yield self._entry(i)
+        for entry in self.extra:
+            yield entry
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._entry(x) for x in range(*i.indices(len(self)))]
+        return self._entry(self._pos(i))
+    def __setitem__(self, i, entry):
+        self.extra[self._extra_pos(i)] = entry
+    def __delitem__(self, i):
+        del self.extra[self._extra_pos(i)]
+    def insert(self, i, entry):
+        """Inserts the given entry before position `i`; only positions after
+        the lines of the file are allowed."""
+        n = len(self)
+        i = max(0, min(n, i + n if i < 0 else i))
+        if i < self._nlines:
+            raise TypeError("lines of a file menu are read-only")
+        self.extra.insert(i - self._nlines, entry)
+    def add(self, name, desc, func=None, args=None, krgs=None):
+        """Appends an entry with the given fields."""
+        self.extra.add(name, desc, func, args, krgs)
+    def enum(self, desc, func=None, args=None, krgs=None):
+        """Appends an entry named by its position, starting from `1`."""
+        self.extra.add(str(len(self) + 1), desc, func, args, krgs)
+    #: File entries are never pulled lazily; see `MenuEntries.pending`.
+    pending = False
+    @property
+    def _changes(self):
+        return self.extra._changes
+    def fetch(self, count=None):
+        """Returns the number of entries; see `MenuEntries.fetch()`."""
+        return len(self)
+    def find(self, name):
+        """Returns the position of the first entry with the given `name` or -1
+        if not found."""
+        try:
+            i = int(name) - 1
+            if 0 <= i < self._nlines and str(i + 1) == name:
+                return i
+        except (TypeError, ValueError):
+            pass
+        i = self.extra.find(name)
+        return i + self._nlines if i >= 0 else -1
+    def line(self, i):
+        """Returns the line of the file at the given index, without the line
+        ending."""
+        start = self._offsets[i]
+        end = self._offsets[i+1] - 1 if i + 1 < self._nlines else self._end
+        line = self._map[start:end]
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        return line.decode(self.encoding, "replace")
+    def _pos(self, i):
+        """Returns the non-negative position for the given list index."""
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("menu entry index out of range")
+        return i
+    def _extra_pos(self, i):
+        """Returns the position in `extra` of the given list index."""
+        i = self._pos(i)
+        if i < self._nlines:
+            raise TypeError("lines of a file menu are read-only")
+        return i - self._nlines
+    def _entry(self, i):
+        """Returns the entry at the given position."""
+        if i < self._nlines:
+            return MenuEntry(str(i + 1), self.line(i), None, _NOARGS, {})
+        return self.extra._entry(i - self._nlines)
+    def _iter_names(self):
+        """Yields the distinct entry names in order of first use."""
+        for i in range(self._nlines):
+            yield str(i + 1)
+        for name in self.extra._iter_names():
+            if self.find(name) >= self._nlines:
+                yield name
+    def _load_index(self, key):
+        """Returns the saved line offsets if they match the given file size
+        and modification time, otherwise None."""
+        import mmap
+        import struct
+        header = struct.Struct(_IDX_FORMAT)
+        try:
+            fi = open(self.idxpath, "rb")
+        except (IOError, OSError):
+            return None
+        with fi:
+            try:
+                magic, size, mtime, count, code = header.unpack(fi.read(header.size))
+            except struct.error:
+                return None
+            code = code.decode("ascii")
+            if magic != _IDX_MAGIC or (size, mtime) != key or code[1:] != sys.byteorder[0]:
+                return None
+            from array import array
+            offsets = array(code[0])
+            nbytes = count * offsets.itemsize
+            if not count:
+                return offsets
+            if hasattr(memoryview, "cast"):
+                self._idxmap = mmap.mmap(fi.fileno(), 0, access=mmap.ACCESS_READ)
+                if len(self._idxmap) < header.size + nbytes:
+                    return None
+                view = memoryview(self._idxmap)[header.size:header.size + nbytes]
+                return view.cast(code[0])
+            offsets.fromstring(fi.read(nbytes))
+            return offsets if len(offsets) == count else None
+    def _save_index(self, key):
+        """Saves the line offsets for the given file size and modification
+        time; errors are ignored since the index can always be rebuilt."""
+        import struct
+        code = (self._offsets.typecode + sys.byteorder[0]).encode("ascii")
+        try:
+            with open(self.idxpath, "wb") as fo:
+                fo.write(struct.pack(_IDX_FORMAT, _IDX_MAGIC, key[0], key[1], len(self._offsets), code))
+                self._offsets.tofile(fo)
+        except (IOError, OSError):
+            pass
+
+class _Positions(object):
+    """List of entry positions that is filled lazily from the given iterable
+    as positions are needed; see `MenuEntries` for the same scheme."""
+    def __init__(self, source):
+        self.items = []
+        self.source = iter(source)
+    @property
+    def pending(self):
+        return self.source is not None
+    def fetch(self, count=None):
+        source = self.source
+        while source is not None and (count is None or len(self.items) < count):
+            try:
+                self.items.append(next(source))
+            except StopIteration:
+                self.source = None
+                break
+        return len(self.items)
+    def __len__(self):
+        return self.fetch()
+    def __getitem__(self, i):
+        if i < 0 or i >= len(self.items):
+            self.fetch(None if i < 0 else i + 1)
+        return self.items[i]
+    def __iter__(self):
+        i = 0
+        while i < len(self.items) or (self.source is not None and self.fetch(i + 1) > i):
+            yield self.items[i]
+            i += 1
+
+class _Subset(object):
+    """View of the entries at the given `_Positions` of a sequence."""
+    def __init__(self, entries, positions):
+        self.entries = entries
+        self.positions = positions
+    @property
+    def pending(self):
+        return self.positions.pending
+    def fetch(self, count=None):
+        return self.positions.fetch(count)
+    def __len__(self):
+        return len(self.positions)
+    def __getitem__(self, i):
+        return self.entries[self.positions[i]]
+    def __iter__(self):
+        for i in self.positions:
+            yield self.entries[i]
+
+class _SearchIndex:
+    """Search index over the lowercase names and descriptions of menu
+    entries. Queries of at least 3 characters match entries containing the
+    query; candidates come from the shortest posting list of the query
+    trigrams and are then checked directly. Shorter queries match entries
+    having a word that starts with the query, found by binary search in the
+    sorted words (a compact prefix trie). Results are `_Positions` that are
+    only checked as far as they are paged; results of recent queries are kept
+    so that a growing query only filters the previous results. Postings are
+    stored as arrays of positions and the text of an entry is read from the
+    entries when it is checked, so the index stays small next to the entries;
+    `FileEntries` are searched with `_ScanIndex` instead."""
+    def __init__(self, entries):
+        self.entries = entries
+        grams = defaultdict(partial(array, "I")) # Trigrams mapped to entry positions.
+        words = defaultdict(partial(array, "I")) # Words mapped to entry positions.
+        for i, entry in enumerate(entries):
+            text = _entry_text(entry)
+            for gram in set([text[x:x+3] for x in range(len(text) - 2)]):
+                grams[gram].append(i)
+            for word in set(text.split()):
+                words[word].append(i)
+        self.grams = dict(grams)
+        self.words = sorted(words) # Sorted words for prefix search.
+        # The postings of all words are joined in word order; the postings
+        # of word `k` are at `wstarts[k]` up to `wstarts[k + 1]`.
+        self.wposts = array("I")
+        self.wstarts = array("I", [0])
+        for word in self.words:
+            self.wposts.extend(words.pop(word))
+            self.wstarts.append(len(self.wposts))
+        self._cache = {}
+        self._last = None # Previous query with substring results.
+    def _text(self, i):
+        """Returns the lowercase text of the entry at the given position."""
+        return _entry_text(self.entries[i])
+    def find(self, query):
+        """Returns the `_Positions` of the entries matching the given query in
+        menu order."""
+        query = query.lower()
+        found = self._cache.get(query)
+        if found is not None:
+            return found
+        text = self._text
+        if len(query) < 3:
+            lo = bisect_left(self.words, query)
+            hi = bisect_left(self.words, query[:-1] + _chr(ord(query[-1]) + 1))
+            if hi - lo <= _SEARCH_MERGE:
+                merged = set(self.wposts[self.wstarts[lo]:self.wstarts[hi]])
+                found = _Positions(sorted(merged))
+            else:
+                # Too many words to merge at once; scan for word starts.
+                import re
+                search = re.compile(r"(?:^|\s)" + re.escape(query)).search
+                found = _Positions(i for i, entry in enumerate(self.entries) if search(_entry_text(entry)))
+        else:
+            candidates = None
+            last = self._last
+            if last and query.startswith(last) and last in self._cache:
+                candidates = self._cache[last]
+                if candidates.pending:
+                    candidates = None
+            for x in range(len(query) - 2):
+                posting = self.grams.get(query[x:x+3], ())
+                if candidates is None or len(posting) < len(candidates):
+                    candidates = posting
+            found = _Positions(i for i in candidates if query in text(i))
+            self._last = query
+        if len(self._cache) >= 256:
+            self._cache.clear()
+        self._cache[query] = found
+        return found
+    def rank(self, query, count):
+        """Returns the positions of up to `count` entries closest to the given
+        query, best first. Entries are scored by the number of query trigrams
+        found in their text, preferring texts containing the whole query and
+        shorter texts. Candidates are counted from the trigram postings
+        starting with the rarest, and postings of the most common trigrams are
+        skipped (or cut short, keeping the first entries) once
+        `_FUZZY_BUDGET` is spent and there are enough. The
+        best candidates are then rescored using all query trigrams."""
+        query = " ".join(query.lower().split())
+        if len(query) < 3:
+            return list(islice(self.find(query), count))
+        qgrams = set([query[x:x+3] for x in range(len(query) - 2)])
+        postings = sorted([self.grams.get(g, ()) for g in qgrams], key=len)
+        counts = Counter()
+        budget = _FUZZY_BUDGET
+        for posting in postings:
+            if budget <= 0 and len(counts) >= count:
+                break
+            posting = posting[:max(budget, count)]
+            budget -= len(posting)
+            counts.update(posting)
+        def score(i):
+            text = self._text(i)
+            shared = sum(1 for g in qgrams if g in text)
+            return (query in text, shared, -len(text), -i)
+        best = [i for i, _ in counts.most_common(count * 4)]
+        return nlargest(count, best, key=score)
+
+class _ScanIndex:
+    """Search over entries too large to hold in memory (see `FileEntries`)
+    that matches like `_SearchIndex` without building an index. Each query
+    scans the entries in order, reading them only as its results are paged,
+    so memory use does not grow with the menu; ranking scans all entries but
+    only keeps the best matches."""
+    def __init__(self, entries):
+        self.entries = entries
+        self._cache = {}
+    def _texts(self):
+        """Yields the position and lowercase text of each entry."""
+        for i, entry in enumerate(self.entries):
+            yield i, _entry_text(entry)
+    def find(self, query):
+        """Returns the `_Positions` of the entries matching the given query in
+        menu order; see `_SearchIndex.find()`."""
+        query = query.lower()
+        found = self._cache.get(query)
+        if found is not None:
+            return found
+        if len(query) < 3:
+            import re
+            search = re.compile(r"(?:^|\s)" + re.escape(query)).search
+            found = _Positions(i for i, text in self._texts() if search(text))
+        else:
+            found = _Positions(i for i, text in self._texts() if query in text)
+        if len(self._cache) >= 256:
+            self._cache.clear()
+        self._cache[query] = found
+        return found
+    def rank(self, query, count):
+        """Returns the positions of up to `count` entries closest to the given
+        query, best first; scored like `_SearchIndex.rank()`."""
+        query = " ".join(query.lower().split())
+        if len(query) < 3:
+            return list(islice(self.find(query), count))
+        qgrams = set([query[x:x+3] for x in range(len(query) - 2)])
+        def scored():
+            for i, text in self._texts():
+                shared = sum(1 for g in qgrams if g in text)
+                if shared:
+                    yield (query in text, shared, -len(text), -i), i
+        return [i for _, i in nlargest(count, scored())]
+
 class Menu:
-    """Menu object that will show the associated MenuEntry items."""
+    """Menu object that will show the associated MenuEntry items. Entries are
+    stored in a compact `MenuEntries` list and indexed by name so that
+    selections can be looked up without scanning the whole menu."""
     def __init__(self, entries=None, **kwargs):
         """Initializes menu object. Any `kwargs` supplied will be passed as
-        defaults to `show_menu()`."""
-        self.entries = entries or []
+        defaults to `show_menu()`. The `entries` may be a lazy iterable; see
+        `MenuEntries`. A plain list of entries is copied into `MenuEntries`,
+        so entries appended to that list later are not shown; change the
+        menu `entries` instead."""
+        if not isinstance(entries, (MenuEntries, FileEntries)):
+            entries = MenuEntries(entries or ())
+        self.entries = entries
         self._show_kwargs = kwargs
+        self._frames = {} # Rendered menu banners; see `MenuMachine`.
+        self._painter = _Painter() # Painter used if shown with `redraw`.
+        self._quit = None # Entries and quit entry added to their lazy source.
+    def _get_entries(self):
+        """Returns `entries`; a plain list assigned to it directly is first
+        converted to `MenuEntries`."""
+        if not isinstance(self.entries, (MenuEntries, FileEntries)):
+            self.entries = MenuEntries(self.entries)
+        return self.entries
+    def _get_index(self):
+        """Returns the entry name index."""
+        return self._get_entries().names
+    def get(self, name):
+        """Returns the entry with the given `name` or None if not found."""
+        return self._get_index().get(name)
     def add(self, name, desc, func=None, args=None, krgs=None):
         """Add a menu entry."""
-        self.entries.append(MenuEntry(name, desc, func, args or [], krgs or {}))
+        self._get_entries().add(name, desc, func, args, krgs)
     def enum(self, desc, func=None, args=None, krgs=None):
         """Add a menu entry."""
-        name = str(len(self.entries)+1)
-        self.entries.append(MenuEntry(name, desc, func, args or [], krgs or {}))
+        self._get_entries().enum(desc, func, args, krgs)
+    def enum_from(self, strs):
+        """Add menu entries enumerated from the given iterable of entry
+        descriptions; items are only pulled as the entries are needed."""
+        self._get_entries().enum_from(strs)
+    def insert(self, idx, name, desc, func=None, args=None, krgs=None):
+        """Inserts a menu entry before the given position `idx`."""
+        entry = MenuEntry(name, desc, func, args or _NOARGS, krgs or _NOKRGS)
+        self._get_entries().insert(idx, entry)
+    def remove(self, name):
+        """Removes the menu entry with the given `name`. Raises `KeyError` if
+        no such entry exists."""
+        entries = self._get_entries()
+        i = entries.find(name)
+        if i < 0:
+            raise KeyError(name)
+        del entries[i]
+    def update(self, name, desc=None, func=None, args=None, krgs=None):
+        """Updates the menu entry with the given `name`; only the supplied
+        fields are changed. Raises `KeyError` if no such entry exists."""
+        entries = self._get_entries()
+        i = entries.find(name)
+        if i < 0:
+            raise KeyError(name)
+        fields = {}
+        if desc is not None: fields['desc'] = desc
+        if func is not None: fields['func'] = func
+        if args is not None: fields['args'] = args
+        if krgs is not None: fields['krgs'] = krgs
+        entries[i] = entries[i]._replace(**fields)
     def show(self, **kwargs):
         """Shows the menu. Any `kwargs` supplied will be passed to
         `show_menu()`."""
-        show_kwargs = copy.deepcopy(self._show_kwargs)
+        kwargs = self._show_args(kwargs)
+        return show_menu(self.entries, **kwargs)
+    def _show_args(self, kwargs):
+        """Returns the kwargs passed to `show_menu()` by `show()`."""
+        show_kwargs = dict(self._show_kwargs)
         show_kwargs.update(kwargs)
-        return show_menu(self.entries, **show_kwargs)
+        show_kwargs['index'] = self._get_index()
+        show_kwargs.setdefault('frames', self._frames)
+        if show_kwargs.get('redraw') is True:
+            show_kwargs['redraw'] = self._painter
+        return show_kwargs
     def run(self, name):
         """Runs the function associated with the given entry `name`."""
-        for entry in self.entries:
-            if entry.name == name:
-                run_func(entry)
-                break
+        entry = self.get(name)
+        if entry:
+            run_func(entry)
     def main(self, auto=None, loop=False, quit=("q", "Quit"), **kwargs):
         """Runs the standard menu main logic. Any `kwargs` supplied will be
         pass to `Menu.show()`. If `argv` is provided to the script, it will be
@@ -128,11 +1828,11 @@ class Menu:
             input for the menu prompts.
           - loop (bool) - If true, the menu will loop until quit.
           - quit ((str,str)) - If provided, adds a quit option to the menu.
+          - session (Session) - If provided, the menu is run within this
+            session instead of using stdin; script arguments are not used
+            in this case.
         """
-        if quit:
-            if self.entries[-1][:2] != quit:
-                self.add(*quit)
-        with StdinAuto(auto):
+        with self._main_context(auto, quit, kwargs):
             if loop:
                 note = "Menu loops until quit."
                 while self.show(note=note, **kwargs) not in quit:
@@ -140,16 +1840,163 @@ class Menu:
             else:
                 note = "Menu does not loop, single entry."
                 return self.show(note=note, **kwargs)
+    def _main_context(self, auto, quit, kwargs):
+        """Adds the quit entry for `main()` and returns the context manager
+        that supplies its input."""
+        if quit:
+            entries = self._get_entries()
+            if entries.pending:
+                # The quit entry follows the lazy source so that the source
+                # is only pulled as far as the menu is shown.
+                if self._quit is None or self._quit[0] is not entries or self._quit[1] != quit:
+                    entries._extend_from([MenuEntry(quit[0], quit[1], None, _NOARGS, _NOKRGS)], False)
+                    self._quit = (entries, quit)
+            elif entries[-1][:2] != quit:
+                self.add(*quit)
+        session = kwargs.pop('session', None)
+        if not session:
+            return StdinAuto(auto)
+        if auto:
+            session = Session(Answers(auto), session.writer, session.qstr, session.istr)
+        return session
+    def show_async(self, **kwargs):
+        """Returns a coroutine that shows the menu like `show()` without
+        blocking the asyncio event loop; see the `qprompt_async` module."""
+        import qprompt_async
+        return qprompt_async.show(self, **kwargs)
+    def main_async(self, auto=None, loop=False, quit=("q", "Quit"), **kwargs):
+        """Returns a coroutine that runs the standard menu main logic like
+        `main()` without blocking the asyncio event loop; see the
+        `qprompt_async` module."""
+        import qprompt_async
+        return qprompt_async.main(self, auto, loop, quit, **kwargs)
+
+class _StatusLine:
+    """Status message line followed by a spinner, or a progress bar if the
+    `total` is known, that is redrawn by a background thread; see
+    `status()` and `progress()`. The thread redraws at most `rate` times per
+    second and only when the text changes, so it takes negligible CPU from
+    the work being reported. If the output is not a terminal, only the
+    message and the final text are shown, or a plain line every `every`
+    seconds if given. If `stats` is true, the rate of progress and the
+    estimated time remaining are also shown."""
+    def __init__(self, msg, total=None, rate=None, writer=None, every=None, stats=False):
+        self.msg = msg
+        self.total = total
+        self.count = 0 # Progress made; see `advance()`.
+        self.rate = rate or _STATUS_RATE
+        self.every = every
+        self.stats = stats
+        self.writer = writer or _out()
+        self.live = _is_tty(self.writer)
+        self._shown = "" # Text of the last drawn frame.
+        self._frame = 0 # Index of the next spinner frame.
+        self._logged = 0 # Count shown by the last plain line.
+        self._began = None
+        self._done = None
+        self._thread = None
+        self._lock = None
+    def start(self):
+        """Shows the message and starts redrawing it if live, or logging it
+        periodically if `every` is given."""
+        import threading
+        import time
+        self._time = time.time
+        self._began = self._time()
+        self._lock = threading.Lock()
+        if not self.live:
+            if not self.every:
+                self.writer._write_now("[!] " + self.msg + " ")
+                return self
+        else:
+            self._draw()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+    def advance(self, count):
+        """Adds the given count to the progress made; the count may be
+        advanced from several threads at once."""
+        with self._lock:
+            self.count += count
+    def stop(self, fin=None):
+        """Stops redrawing and shows the message followed by `fin` and a line
+        break, or by nothing if None (e.g. if the work failed)."""
+        if self._thread:
+            self._done.set()
+            self._thread.join()
+        if self.live:
+            self._draw("" if fin is None else fin + "\n")
+        elif not self.every:
+            if fin is not None:
+                self.writer._write_now(fin + "\n")
+        elif fin is not None:
+            self.writer._write_now("[!] %s %s\n" % (self.msg, fin))
+    def _run(self):
+        if self.live:
+            while not self._done.wait(1.0 / self.rate):
+                self._draw()
+        else:
+            while not self._done.wait(self.every):
+                self._log()
+    def _draw(self, tail=None):
+        """Redraws the line with the given tail, or the current spinner or
+        progress bar if None."""
+        if tail is None:
+            tail = self._progress()
+        text = "[!] %s %s" % (self.msg, tail)
+        if text == self._shown:
+            return
+        if _use_ansi(self.writer):
+            self.writer._write_now(_ESC_CLEAR_LINE + text)
+        else:
+            # Spaces overwrite the rest of a longer previous text; they go
+            # before the line break of a final text.
+            line = text.rstrip("\n")
+            pad = " " * (len(self._shown.rstrip("\n")) - len(line))
+            self.writer._write_now("\r" + line + pad + text[len(line):])
+        self._shown = text
+    def _log(self):
+        """Writes a plain line showing the progress if any was made since the
+        last one."""
+        count = self.count
+        if count != self._logged:
+            self.writer._write_now("[!] %s %s\n" % (self.msg, self._progress(False)))
+            self._logged = count
+    def _progress(self, animate=True):
+        """Returns the text showing the current progress, without the bar and
+        spinner if not `animate`."""
+        count = self.count
+        if self.total:
+            done = min(count, self.total)
+            text = "%u/%u %3u%%" % (count, self.total, 100 * done // self.total)
+            if animate:
+                fill = _BAR_WIDTH * done // self.total
+                text = "[%s%s] %s" % ("#" * fill, "." * (_BAR_WIDTH - fill), text)
+        elif animate:
+            spin = _SPINNER[self._frame % len(_SPINNER)]
+            self._frame += 1
+            text = "%s %u" % (spin, count) if count else spin
+        else:
+            text = "%u" % count
+        if self.stats:
+            elapsed = self._time() - self._began
+            speed = count / elapsed if elapsed > 0 else 0.0
+            text += " %.1f/s" % speed
+            if self.total and speed:
+                text += " ETA " + _clock(max(self.total - count, 0) / speed)
+        return text
 
 ##==============================================================#
 ## SECTION: Function Definitions                                #
 ##==============================================================#
 
 #: Returns a line of characters at the given width.
-getline = lambda c, w: "".join([c for _ in range(w)])[:w]
+getline = lambda c, w: (c * w)[:w] if w > 0 else ""
 
 #: String index replace.
-stridxrep = lambda s, i, r: "".join([(s[x] if x != i else r) for x in range(len(s))])
+stridxrep = lambda s, i, r: s[:i] + r + s[i+1:] if 0 <= i < len(s) else s
 
 #: Allows stdin to be set via function; use with `stdin_setup` context.
 setinput = lambda x: [
@@ -158,98 +2005,178 @@ setinput = lambda x: [
         sys.stdin.write(x),
         sys.stdin.seek(0)]
 
-try:
-    print("", end="", flush=True)
-    echo = partial(print, end="\n", flush=True)
-except TypeError:
-    # TypeError: 'flush' is an invalid keyword argument for this function
-    def echo(text="", end="\n", flush=True):
-        """Generic echo/print function; based off code from ``blessed`` package."""
-        sys.stdout.write(u'{0}{1}'.format(text, end))
+def echo(*args, **kwargs):
+    """Generic echo/print function; accepts the same `sep`, `end` and `flush`
+    keyword arguments as `print()`. Output goes through the writer of the
+    current session unless a `file` is given."""
+    sep = kwargs.get('sep', " ")
+    end = kwargs.get('end', "\n")
+    flush = kwargs.get('flush', True)
+    text = sep.join(["%s" % (a,) for a in args]) + end
+    if kwargs.get('file'):
+        kwargs['file'].write(text)
         if flush:
-            sys.stdout.flush()
+            kwargs['file'].flush()
+        return
+    _out().write(text, flush)
+
+def _session():
+    """Returns the current session of the calling thread or task."""
+    stack = _get_sessions()
+    return stack[-1] if stack else _default_session
+
+def _out():
+    """Returns the writer used for output by the current session."""
+    return _session().out()
+
+def set_writer(writer=None):
+    """Sets the writer used for all console output and returns the previous
+    one. If no writer is given, output goes to `sys.stdout`.
+
+    **Examples**:
+    ::
+        set_writer(Writer(open("log.txt", "w")))
+        set_writer(NullWriter())
+    """
+    global _writer
+    prev = _writer
+    _writer = writer or Writer()
+    return prev
+
+def _rename_kwargs(kwargs):
+    """Renames the given kwargs in place to the short names expected by the
+    library functions."""
+    for v in list(kwargs):
+        k = _KWARG_ALIASES.get(v)
+        if k:
+            kwargs[k] = kwargs.pop(v)
 
 def _format_kwargs(func):
     """Decorator to handle formatting kwargs to the proper names expected by
-    the associated function. The formats dictionary string keys will be used as
-    expected function kwargs and the value list of strings will be renamed to
-    the associated key string."""
-    formats = {}
-    formats['blk'] = ["blank"]
-    formats['dft'] = ["default"]
-    formats['hdr'] = ["header"]
-    formats['hlp'] = ["help"]
-    formats['msg'] = ["message"]
-    formats['shw'] = ["show"]
-    formats['vld'] = ["valid"]
+    the associated function; see `_KWARG_FORMATS`. Additionally, if a
+    `session` kwarg is supplied, the function is run within that session.
+    Calls without long names or a session go straight to the function."""
+    @wraps(func)
     def inner(*args, **kwargs):
-        for k in formats.keys():
-            for v in formats[k]:
-                if v in kwargs:
-                    kwargs[k] = kwargs[v]
-                    kwargs.pop(v)
+        if not kwargs:
+            return func(*args)
+        if _KWARG_HANDLED.isdisjoint(kwargs):
+            return func(*args, **kwargs)
+        _rename_kwargs(kwargs)
+        session = kwargs.pop('session', None)
+        if session:
+            with session:
+                return func(*args, **kwargs)
         return func(*args, **kwargs)
     return inner
 
 @_format_kwargs
 def show_limit(entries, **kwargs):
     """Shows a menu but limits the number of entries shown at a time.
-    Functionally equivalent to `show_menu()` with the `limit` parameter set."""
-    limit = kwargs.pop('limit', 5)
-    if limit <= 0:
-        return show_menu(entries, **kwargs)
-    istart = 0 # Index of group start.
-    iend = limit # Index of group end.
-    dft = kwargs.pop('dft', None)
-    if type(dft) == int:
-        dft = str(dft)
-    while True:
-        if iend > len(entries):
-            iend = len(entries)
-            istart = iend - limit
-        if istart < 0:
-            istart = 0
-            iend = limit
-        unext = len(entries) - iend # Number of next entries.
-        uprev = istart # Number of previous entries.
-        nnext = "" # Name of 'next' menu entry.
-        nprev = "" # Name of 'prev' menu entry.
-        dnext = "" # Description of 'next' menu entry.
-        dprev = "" # Description of 'prev' menu entry.
-        group = copy.deepcopy(entries[istart:iend])
-        names = [i.name for i in group]
-        if unext > 0:
-            for i in ["n", "N", "next", "NEXT", "->", ">>", ">>>"]:
-                if i not in names:
-                    nnext = i
-                    dnext = "Next %u of %u entries" % (unext, len(entries))
-                    group.append(MenuEntry(nnext, dnext, None, None, None))
-                    names.append("n")
-                    break
-        if uprev > 0:
-            for i in ["p", "P", "prev", "PREV", "<-", "<<", "<<<"]:
-                if i not in names:
-                    nprev = i
-                    dprev = "Previous %u of %u entries" % (uprev, len(entries))
-                    group.append(MenuEntry(nprev, dprev, None, None, None))
-                    names.append("p")
-                    break
-        tmpdft = None
-        if dft != None:
-            if dft not in names:
-                if "n" in names:
-                    tmpdft = "n"
-            else:
-                tmpdft = dft
-        result = show_menu(group, dft=tmpdft, **kwargs)
-        if result == nnext or result == dnext:
-            istart += limit
-            iend += limit
-        elif result == nprev or result == dprev:
-            istart -= limit
-            iend -= limit
+    Functionally equivalent to `show_menu()` with the `limit` parameter set.
+    Pages are shown directly from `entries` without copying them. Besides
+    next/previous, navigation entries are added to jump to the first or last
+    page and to go to a given page number.
+
+    Entering `/term` pages through only the entries whose name or description
+    contains the term (ignoring case); terms shorter than 3 characters match
+    the start of words instead. Entering `/` shows all entries again. The
+    search index is built on the first search and kept with a `MenuEntries`
+    or `FileEntries` list until it changes."""
+    kwargs.setdefault('limit', 5)
+    return show_menu(entries, **kwargs)
+
+def _entry_text(entry):
+    """Returns the lowercase text of the given entry matched by searches."""
+    return ("%s %s" % (entry.name, entry.desc)).lower()
+
+def _count(entries, need=None):
+    """Returns the number of entries. A lazy `MenuEntries` source is only
+    pulled until `need` entries are available, or to the end if None."""
+    fetch = getattr(entries, "fetch", None)
+    return fetch(need) if fetch else len(entries)
+
+def _line_offsets(data, size):
+    """Returns an array of the start offsets of the lines in the given bytes
+    (e.g. a memory-mapped file) of the given size. The data is scanned in
+    chunks ending at a line break and the offsets are computed from the line
+    lengths so that no per-line Python objects are kept."""
+    from array import array
+    offsets = array("I" if size < 1 << 32 else "Q")
+    pos = 0
+    while pos < size:
+        end = data.rfind(b"\n", pos, min(pos + _IDX_CHUNK, size))
+        if end < 0:
+            end = data.find(b"\n", pos + _IDX_CHUNK)
+        if end < 0:
+            end = size - 1
+        chunk = data[pos:end+1]
+        lines = chunk.split(b"\n")
+        if chunk.endswith(b"\n"):
+            lines.pop()
+        # The start of each line is the start of the previous line plus its
+        # length and line break.
+        lens = (len(line) + 1 for line in islice(lines, len(lines) - 1))
+        if _accumulate:
+            offsets.extend(_accumulate(chain([pos], lens)))
         else:
-            return result
+            start = pos
+            offsets.append(start)
+            for n in lens:
+                start += n
+                offsets.append(start)
+        pos = end + 1
+    return offsets
+
+def _limit_page(entries, ipage, limit, dft):
+    """Returns the given page of a limited menu as a tuple of the page view,
+    the navigation entry names mapped to the page index they show, the name
+    of the 'go to page' entry and the default for the page."""
+    total = _count(entries, (ipage + 1) * limit + 1)
+    more = getattr(entries, "pending", False) # If true, the total is not known yet.
+    npages = (total + limit - 1) // limit
+    istart = max(0, min(ipage * limit, total - limit)) # Index of page start.
+    iend = min(istart + limit, total) # Index of page end.
+    page = _MenuPage(entries, istart, iend)
+    index = page.index
+    nav = {}
+    def add_nav(names, desc, target):
+        for name in names:
+            if name not in index:
+                entry = MenuEntry(name, desc, None, None, None)
+                page.extra.append(entry)
+                index[name] = entry
+                nav[name] = target
+                return name
+    unext = total - iend # Number of next entries.
+    uprev = istart # Number of previous entries.
+    nnext = None # Name of 'next' menu entry.
+    njump = None # Name of 'go to page' menu entry.
+    if more:
+        nnext = add_nav(_NAV_NEXT, "Next page", ipage + 1)
+    elif unext > 0:
+        nnext = add_nav(_NAV_NEXT, "Next %u of %u entries" % (unext, total), ipage + 1)
+    if uprev > 0 and more:
+        add_nav(_NAV_PREV, "Previous %u entries" % (uprev), ipage - 1)
+    elif uprev > 0:
+        add_nav(_NAV_PREV, "Previous %u of %u entries" % (uprev, total), ipage - 1)
+    if uprev > limit:
+        add_nav(_NAV_FIRST, "First page", 0)
+    if more:
+        add_nav(_NAV_LAST, "Last page", -1)
+    elif unext > limit:
+        add_nav(_NAV_LAST, "Last page", npages - 1)
+    if more:
+        njump = add_nav(_NAV_JUMP, "Go to page (%u)" % (ipage + 1), None)
+    elif npages > 2:
+        njump = add_nav(_NAV_JUMP, "Go to page (%u of %u)" % (ipage + 1, npages), None)
+    tmpdft = None
+    if dft != None:
+        if dft in index:
+            tmpdft = dft
+        elif nnext:
+            tmpdft = nnext
+    return page, nav, njump, tmpdft
 
 @_format_kwargs
 def show_menu(entries, **kwargs):
@@ -263,62 +2190,117 @@ def show_menu(entries, **kwargs):
       - compact (bool) - If true, the menu items will not be displayed [default: False].
       - returns (str) - Controls what part of the menu entry is returned [default: name].
       - limit (int) - If set, limits the number of menu entries show at a time [default: None].
+      - index (dict) - Mapping of entry names to entries used to check the
+        selection; built from `entries` if not supplied.
+      - clear (bool) - If true, the console is cleared before the menu is shown [default: False].
+      - frames (dict) - If given, the rendered banner of the whole menu is
+        cached in this dict until the entries or header change; used by
+        `Menu`.
+      - redraw (bool) - If true, new pages and menus are painted over the
+        previous one, only rewriting the lines that changed; requires ANSI
+        escape sequences [default: False].
+      - fuzzy (bool|int) - If set, input that is not an entry name shows the
+        entries closest to it by name and description, best first; an int
+        sets how many are shown [default: False (10 if true)].
+      - session (Session) - Session used for input and output [default: current session].
     """
-    hdr = kwargs.get('hdr', "")
-    note = kwargs.get('note', "")
-    msg = kwargs.get('msg', "Enter menu selection")
-    dft = kwargs.get('dft', "")
-    compact = kwargs.get('compact', False)
     returns = kwargs.get('returns', "name")
-    limit = kwargs.get('limit', None)
-    dft = kwargs.get('dft', None)
-    if limit:
-        return show_limit(entries, **kwargs)
-    def show_banner():
-        banner = "-- MENU"
-        if hdr:
-            banner += ": " + hdr
-        banner += " --"
-        echo(banner)
-        for i in entries:
-            echo("  (%s) %s" % (i.name, i.desc))
-    valid = [i.name for i in entries]
-    if type(dft) == int:
-        dft = str(dft)
-    if dft not in valid:
-        dft = None
-    if not compact:
-        show_banner()
-    if note:
-        alert(note)
-    choice = ask(msg, vld=valid, dft=dft)
-    entry = [i for i in entries if i.name == choice][0]
+    entry = _drive(MenuMachine(entries, **kwargs))
     run_func(entry)
     return getattr(entry, returns)
 
+def _menu_banner(entries, hdr=""):
+    """Returns the banner text showing the given menu entries."""
+    banner = "-- MENU"
+    if hdr:
+        banner += ": " + hdr
+    banner += " --"
+    lines = [banner]
+    for i in entries:
+        lines.append("  (%s) %s" % (i.name, i.desc))
+    lines.append("")
+    return "\n".join(lines)
+
+def _drive(machine, session=None):
+    """Drives the given prompt state machine using the given session or the
+    current session for input and output; returns the final answer. The
+    output events before each read are written as a single frame."""
+    if session:
+        with session:
+            return _drive(machine)
+    session = _session()
+    steps = _steps(machine, session)
+    request, text = next(steps)
+    while type(request) is not Answer:
+        request, text = steps.send(session.read(text, request.shw))
+    return request.value
+
+def _steps(machine, session):
+    """Acts on the output events of the given prompt state machine using the
+    given session and yields each `Read` event with its prompt text; the line
+    of input read for it must be sent back. The final `Answer` event is
+    yielded last. Shared by `_drive()` and `qprompt_async.drive()`."""
+    out = session.out()
+    painter = _resume_painter(machine, session)
+    echoes = painter and session._echoes()
+    events = machine.start()
+    while True:
+        request = events[-1]
+        if len(events) > 1:
+            with out:
+                for event in events[:-1]:
+                    if type(event) is Render:
+                        out.write(event.text)
+                    else:
+                        clear()
+        if type(request) is Answer:
+            yield request, None
+            return
+        text = session._text(request)
+        line = yield request, text
+        if echoes:
+            painter.echoed(text + line if request.shw else text)
+        events = machine.feed(line)
+
+def _resume_painter(machine, session):
+    """Supplies the painter of the given machine, if it redraws, with the
+    session writer and the terminal settings; returns the painter or None."""
+    painter = getattr(machine, "painter", None)
+    if painter:
+        columns, lines = _term_size()
+        painter.resume(session.out(), columns, _use_ansi(session.out()), lines)
+    return painter
+
 def run_func(entry):
-    """Runs the function associated with the given entry."""
+    """Runs the function associated with the given entry and returns its
+    result."""
     if entry.func:
         if entry.args and entry.krgs:
-            entry.func(*entry.args, **entry.krgs)
+            return entry.func(*entry.args, **entry.krgs)
         elif entry.args:
-            entry.func(*entry.args)
+            return entry.func(*entry.args)
         elif entry.krgs:
-            entry.func(**entry.krgs)
+            return entry.func(**entry.krgs)
         else:
-            entry.func()
+            return entry.func()
 
 def enum_menu(strs, menu=None, *args, **kwargs):
     """Enumerates the given list of strings into returned menu.
 
     **Params**:
+      - strs ([str]) - Entry descriptions. If an iterator or generator without
+        a length is given, it is pulled lazily only as far as the menu is
+        shown (e.g. paged with `show_limit()`).
       - menu (Menu) - Existing menu to append. If not provided, a new menu will
         be created.
     """
     if not menu:
         menu = Menu(*args, **kwargs)
-    for s in strs:
-        menu.enum(s)
+    if hasattr(strs, "__len__"):
+        for s in strs:
+            menu.enum(s)
+    else:
+        menu.enum_from(strs)
     return menu
 
 def cast(val, typ=int):
@@ -330,142 +2312,264 @@ def cast(val, typ=int):
         val = None
     return val
 
+def _fmt_int(val):
+    """Input format function used by `ask_int()`."""
+    return cast(val, int)
+
+def _fmt_float(val):
+    """Input format function used by `ask_float()`."""
+    return cast(val, float)
+
+def _readline(readline):
+    """Returns the next line read by the given `readline` function without
+    the line ending. Raises `EOFError` at the end of the input."""
+    line = readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\r\n")
+
+def _has_fileno(stream):
+    """Returns true if the given stream is backed by a file descriptor, in
+    which case reading from it may block."""
+    try:
+        stream.fileno()
+        return True
+    except Exception:
+        return False
+
+def _getpass(prompt=""):
+    """Reads user input without echoing it."""
+    from getpass import getpass
+    return getpass(prompt)
+
+def _validator(v):
+    """Returns a `_Valid` check for the given validator in the `vld` of a
+    prompt, or None if it is not a validator. Membership is checked without
+    generating or copying values: in O(1) for intervals, ranges and frozensets
+    and by a single match for regex patterns."""
+    if isinstance(v, Interval):
+        return _Valid(v.__contains__, str(v))
+    if isinstance(v, _range):
+        return _Valid(partial(_in_range, v), _range_text(v))
+    if isinstance(v, frozenset):
+        if len(v) > _HELP_VALUES:
+            return _Valid(v.__contains__, "<one of %u values>" % (len(v)))
+        try: values = sorted(v)
+        except TypeError: values = list(v)
+        return _Valid(v.__contains__, " | ".join([str(x) for x in values]))
+    if hasattr(v, "pattern") and hasattr(v, "match"):
+        import re
+        match = getattr(v, "fullmatch", None) or re.compile("(?:%s)\\Z" % (v.pattern), v.flags).match
+        return _Valid(lambda ans: match(str(ans)) is not None, "/%s/" % (v.pattern))
+    return None
+
+def _all_plain(values):
+    """Returns true if all the given valid values are plain values (see
+    `_PLAIN_TYPES`) rather than types, functions or validators."""
+    for v in values:
+        if type(v) not in _PLAIN_TYPES:
+            return False
+    return True
+
+def _in_range(r, x):
+    """Returns true if the given number is in the given range; checked in
+    O(1) for any Python version and number type."""
+    try:
+        i = int(x)
+    except (TypeError, ValueError):
+        return False
+    if i != x or isinstance(x, (str, bytes, type(u""))) or not len(r):
+        return False
+    step = r[1] - r[0] if len(r) > 1 else 1
+    return 0 == (i - r[0]) % step and 0 <= (i - r[0]) // step < len(r)
+
+def _range_text(r):
+    """Returns the help text describing the given range."""
+    if not len(r):
+        return "<none>"
+    if len(r) > 1 and 1 != r[1] - r[0]:
+        return "%s..%s (step %s)" % (r[0], r[-1], r[1] - r[0])
+    return "%s..%s" % (r[0], r[-1])
+
+def _prompt(msg, fmt=None, dft=None, vld=None, shw=True, blk=False, hlp=None):
+    """Returns the `Prompt` for the given args. The prompts of the `ask()` and
+    `ask_X()` functions are kept for reuse when their valid entries are a
+    short list of plain values and types, which cannot change afterwards; any
+    other prompt is created anew."""
+    if vld is None:
+        vkey = vtypes = None
+    elif type(vld) in (list, tuple) and len(vld) <= _PROMPT_CACHE_VLD:
+        vkey = tuple(vld)
+        vtypes = tuple(map(type, vkey))
+        if not _PROMPT_CACHE_TYPES.issuperset(vtypes):
+            return Prompt(msg, fmt, dft, vld, shw, blk, hlp)
+    else:
+        return Prompt(msg, fmt, dft, vld, shw, blk, hlp)
+    key = (msg, fmt, type(dft), dft, type(vld), vkey, vtypes, shw, blk, hlp)
+    try:
+        prompt = _prompts.get(key)
+    except TypeError:
+        return Prompt(msg, fmt, dft, vld, shw, blk, hlp)
+    if prompt is None:
+        if len(_prompts) >= _PROMPT_CACHE:
+            _prompts.clear()
+        prompt = _prompts[key] = Prompt(msg, fmt, dft, vld, shw, blk, hlp)
+    return prompt
+
+def _page_check(entries, limit):
+    """Returns a function that checks for a valid page number of the given
+    entries; a lazy entry source is only pulled up to the given page."""
+    def page(num):
+        return 0 < num and _count(entries, (num - 1) * limit + 1) > (num - 1) * limit
+    return page
+
 @_format_kwargs
 def ask(msg="Enter input", fmt=None, dft=None, vld=None, shw=True, blk=False, hlp=None):
     """Prompts the user for input and returns the given answer. Optionally
-    checks if answer is valid.
+    checks if answer is valid. Use a `Prompt` object instead when asking the
+    same question repeatedly.
 
     **Params**:
       - msg (str) - Message to prompt the user with.
       - fmt (func) - Function used to format user input.
       - dft (int|float|str) - Default value if input is left blank.
-      - vld ([int|float|str|func]) - Valid input entries.
+      - vld ([int|float|str|func]) - Valid input entries; may include
+        validators such as an `Interval` (see `Prompt`).
       - shw (bool) - If true, show the user's input as typed.
       - blk (bool) - If true, accept a blank string as valid input. Note that
         supplying a default value will disable accepting blank input.
+      - session (Session) - Session used for input and output [default: current session].
     """
-    def print_help():
-        lst = [v for v in vld if not callable(v)]
-        if blk:
-            lst.remove("")
-        for v in vld:
-            if not callable(v):
-                continue
-            if int == v:
-                lst.append("<int>")
-            elif float == v:
-                lst.append("<float>")
-            elif str == v:
-                lst.append("<str>")
-            else:
-                lst.append("(" + v.__name__ + ")")
-        if lst:
-            echo("[HELP] Valid input: %s" % (" | ".join([str(l) for l in lst])))
-        if hlp:
-            echo("[HELP] Extra notes: " + hlp)
-        if blk:
-            echo("[HELP] Input may be blank.")
-    vld = vld or []
-    hlp = hlp or ""
-    if not hasattr(vld, "__iter__"):
-        vld = [vld]
-    if not hasattr(fmt, "__call__"):
-        fmt = lambda x: x  # NOTE: Defaults to function that does nothing.
-    msg = "%s%s" % (QSTR, msg)
-    dft = fmt(dft) if dft != None else None # Prevents showing [None] default.
-    if dft != None:
-        msg += " [%s]" % (dft if type(dft) is str else repr(dft))
-        vld.append(dft)
-        blk = False
-    if vld:
-        # Sanitize valid inputs.
-        vld = list(set([fmt(v) if fmt(v) else v for v in vld]))
-        if blk and "" not in vld:
-            vld.append("")
-        # NOTE: The following fixes a Py3 related bug found in `0.8.1`.
-        try: vld = sorted(vld)
-        except: pass
-    msg += ISTR
-    ans = None
-    while ans is None:
-        get_input = _input if shw else getpass
-        ans = get_input(msg)
-        if "?" == ans:
-            print_help()
-            ans = None
-            continue
-        if "" == ans:
-            if dft != None:
-                ans = dft if not fmt else fmt(dft)
-                break
-            if "" not in vld:
-                ans = None
-                continue
-        try:
-            ans = ans if not fmt else fmt(ans)
-        except:
-            ans = None
-        if vld:
-            for v in vld:
-                if type(v) is type and cast(ans, v) is not None:
-                    ans = cast(ans, v)
-                    break
-                elif hasattr(v, "__call__"):
-                    try:
-                        if v(ans):
-                            break
-                    except:
-                        pass
-                elif ans in vld:
-                    break
-            else:
-                ans = None
-    return ans
+    return _prompt(msg, fmt, dft, vld, shw, blk, hlp).ask()
 
 @_format_kwargs
 def ask_yesno(msg="Proceed?", dft=None):
     """Prompts the user for a yes or no answer. Returns True for yes, False
     for no."""
-    yes = ["y", "yes", "Y", "YES"]
-    no = ["n", "no", "N", "NO"]
-    if dft != None:
-        dft = yes[0] if (dft in yes or dft == True) else no[0]
-    return ask(msg, dft=dft, vld=yes+no) in yes
+    return _yesno_prompt(msg, dft).ask() in _YES
 
 @_format_kwargs
 def ask_int(msg="Enter an integer", dft=None, vld=None, hlp=None):
     """Prompts the user for an integer."""
-    vld = vld or [int]
-    return ask(msg, dft=dft, vld=vld, fmt=partial(cast, typ=int), hlp=hlp)
+    return _int_prompt(msg, dft, vld, hlp).ask()
 
 @_format_kwargs
 def ask_float(msg="Enter a float", dft=None, vld=None, hlp=None):
     """Prompts the user for a float."""
-    vld = vld or [float]
-    return ask(msg, dft=dft, vld=vld, fmt=partial(cast, typ=float), hlp=hlp)
+    return _float_prompt(msg, dft, vld, hlp).ask()
 
 @_format_kwargs
 def ask_str(msg="Enter a string", dft=None, vld=None, shw=True, blk=True, hlp=None):
     """Prompts the user for a string."""
-    vld = vld or [str]
-    return ask(msg, dft=dft, vld=vld, shw=shw, blk=blk, hlp=hlp)
+    return _str_prompt(msg, dft, vld, shw, blk, hlp).ask()
+
+# The prompts of the typed `ask_X()` functions are built by the following so
+# that `qprompt_async` asks exactly the same prompts.
+
+def _yesno_prompt(msg, dft):
+    """Returns the `Prompt` of `ask_yesno()`; yes answers are in `_YES`."""
+    if dft != None:
+        dft = _YES[0] if (dft in _YES or dft == True) else _NO[0]
+    return _prompt(msg, dft=dft, vld=_YESNO)
+
+def _int_prompt(msg, dft, vld, hlp):
+    """Returns the `Prompt` of `ask_int()`."""
+    return _prompt(msg, _fmt_int, dft, vld or _VLD_INT, hlp=hlp)
+
+def _float_prompt(msg, dft, vld, hlp):
+    """Returns the `Prompt` of `ask_float()`."""
+    return _prompt(msg, _fmt_float, dft, vld or _VLD_FLOAT, hlp=hlp)
+
+def _str_prompt(msg, dft, vld, shw, blk, hlp):
+    """Returns the `Prompt` of `ask_str()`."""
+    return _prompt(msg, dft=dft, vld=vld or _VLD_STR, shw=shw, blk=blk, hlp=hlp)
 
 def ask_captcha(length=4):
     """Prompts the user for a random string."""
+    import random
+    import string
     captcha = "".join(random.choice(string.ascii_lowercase) for _ in range(length))
     ask_str('Enter the following letters, "%s"' % (captcha), vld=[captcha, captcha.upper()], blk=False)
 
 def pause():
-    """Pauses and waits for user interaction."""
-    getpass("Press ENTER to continue...")
+    """Pauses and waits for user interaction. The user is waited on at the
+    terminal, without using up answers scripted with `Answers` or
+    `StdinAuto`; a session reading from a function or file reads a line from
+    it instead."""
+    _pause(_session())
+
+def _pause(session):
+    """Pauses like `pause()` using the given session."""
+    if _pauses_terminal(session):
+        session.out().read(_PAUSE_TEXT, _getpass)
+    else:
+        session.read(_PAUSE_TEXT, False)
+
+def _pauses_terminal(session):
+    """Returns true if `pause()` waits on the terminal for the given
+    session."""
+    return session.input is None or isinstance(session.input, Answers)
+
+def _use_ansi(writer=None):
+    """Returns true if ANSI escape sequences can be used to control the
+    terminal that the given writer, or the current writer if None, outputs to.
+    On Windows, this attempts to enable virtual terminal processing for the
+    console. The terminal support is checked once then reused."""
+    global _ansi
+    if _ansi is None:
+        _ansi = "dumb" != os.environ.get("TERM")
+        if _ansi and sys.platform.startswith("win"):
+            _ansi = _enable_vt()
+    return _ansi and _is_tty(writer or _out())
+
+def _enable_vt():
+    """Enables ANSI escape sequence handling for the Windows console. Returns
+    true if successful."""
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11) # Standard output handle.
+        mode = ctypes.c_ulong()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except:
+        return False
 
 def clear():
-    """Clears the console."""
+    """Clears the console. ANSI escape sequences are written when supported,
+    otherwise the system clear command is run."""
+    if _use_ansi():
+        _out().write(_ESC_CLEAR)
+        return
+    from subprocess import call
     if sys.platform.startswith("win"):
         call("cls", shell=True)
     else:
         call("clear", shell=True)
 
+def clear_line():
+    """Clears the current console line and moves the cursor to its start."""
+    if _use_ansi():
+        _out().write(_ESC_CLEAR_LINE)
+    else:
+        _out().write("\r")
+
+def move_cursor(row, col=1):
+    """Moves the cursor to the given 1-based console `row` and `col`."""
+    if _use_ansi():
+        _out().write(_ESC_MOVE % (row, col))
+
+def cursor_up(num=1):
+    """Moves the cursor up the given number of lines."""
+    if num > 0 and _use_ansi():
+        _out().write(_ESC_UP % (num))
+
+def cursor_down(num=1):
+    """Moves the cursor down the given number of lines."""
+    if num > 0 and _use_ansi():
+        _out().write(_ESC_DOWN % (num))
+
 def status(*args, **kwargs):
     """Prints a status message at the start and finish of an associated
     function. Can be used as a function decorator or as a function that accepts
@@ -485,15 +2589,54 @@ def status(*args, **kwargs):
       - fargs (list) - List of `args` passed to `func`.
       - fkrgs (dict) - Dictionary of `kwargs` passed to `func`.
       - fin (str) [kwargs] - Message to print when `func` finishes.
+
+    The following parameters are available in both cases:
+
+      - spin (bool) [kwargs] - If true, a spinner is shown while `func` runs.
+      - total (int) [kwargs] - If given, a progress bar is shown while `func`
+        runs; progress is reported by calling `advance()`.
+      - rate (int) [kwargs] - Maximum number of redraws per second of the
+        spinner or progress bar [default: 10].
+
+    The spinner and progress bar are drawn by a background thread and are
+    only shown if the output is a terminal.
+
+    **Examples**:
+    ::
+        status("Copying...", shutil.copy, ["a.iso", "b.iso"], spin=True)
+
+        @status("Processing...", total=len(files))
+        def process():
+            for f in files:
+                handle(f)
+                advance()
     """
     def decor(func):
+        @wraps(func)
         def wrapper(*args, **krgs):
-            echo("[!] " + msg, end=" ", flush=True)
-            result = func(*args, **krgs)
-            echo(fin, flush=True)
+            if not (spin or total):
+                echo("[!] " + msg, end=" ", flush=True)
+                result = func(*args, **krgs)
+                echo(fin, flush=True)
+                return result
+            line = _StatusLine(msg, total, rate).start()
+            lines = _get_status_lines()
+            if line.live:
+                _set_status_lines(lines + (line,))
+            try:
+                result = func(*args, **krgs)
+            except:
+                line.stop()
+                raise
+            finally:
+                _set_status_lines(lines)
+            line.stop(fin)
             return result
         return wrapper
     fin = kwargs.pop('fin', "DONE.")
+    spin = kwargs.pop('spin', False)
+    total = kwargs.pop('total', None)
+    rate = kwargs.pop('rate', None)
     args = list(args)
     if len(args) > 1 and callable(args[1]):
         msg = args.pop(0)
@@ -506,6 +2649,72 @@ def status(*args, **kwargs):
     msg = args.pop(0)
     return decor
 
+def advance(count=1):
+    """Advances the progress shown by the innermost running `status()` with a
+    spinner or progress bar by the given count; does nothing if there is
+    none. Only a `status()` running in the current thread or asyncio task is
+    advanced, or in the one whose context was copied (e.g. by
+    `asyncio.to_thread()`)."""
+    lines = _get_status_lines()
+    if lines:
+        lines[-1].advance(count)
+
+def progress(iterable, msg="Working...", total=None, fin="DONE.", rate=None, every=None):
+    """Yields the items of the given iterable while showing a status message
+    followed by the count, rate and estimated time remaining. The line is
+    redrawn by a background thread at a fixed rate rather than per item, so
+    the loop itself is only slowed by tens of nanoseconds per item. If the
+    output is not a terminal, a plain line is logged periodically instead.
+
+    **Params**:
+
+      - iterable (iterable) - Items to yield.
+      - msg (str) - Message to print while iterating.
+      - total (int) - Number of items expected; a progress bar and the
+        estimated time remaining are shown if known [default: `len(iterable)`
+        if available].
+      - fin (str) - Message to print when all items have been yielded. Only
+        the message is left if iteration stops early or fails.
+      - rate (int) - Maximum number of redraws per second [default: 10].
+      - every (int) - Seconds between plain lines if the output is not a
+        terminal [default: 10].
+
+    **Examples**:
+    ::
+        for path in progress(paths, "Hashing..."):
+            hash_file(path)
+    """
+    if total is None:
+        try:
+            total = len(iterable)
+        except TypeError:
+            pass
+    line = _StatusLine(msg, total, rate, every=every or _STATUS_EVERY, stats=True).start()
+    done = False
+    try:
+        # NOTE: Storing the count directly on the line keeps the per-item cost
+        # to one attribute assignment; the thread reads it when redrawing.
+        for line.count, item in enumerate(iterable, 1):
+            yield item
+        done = True
+    finally:
+        line.stop(fin if done else None)
+
+def _clock(secs):
+    """Returns the given number of seconds as H:MM:SS."""
+    mins, secs = divmod(int(secs), 60)
+    return "%u:%02u:%02u" % (mins // 60, mins % 60, secs)
+
+def _is_tty(writer):
+    """Returns true if the given writer outputs to a terminal."""
+    if isinstance(writer, NullWriter):
+        return False
+    stream = getattr(writer, "stream", None) or sys.stdout
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
 def alert(msg, **kwargs):
     """Prints alert message to console."""
     echo("[!] " + msg, **kwargs)
@@ -531,30 +2740,266 @@ def warn(msg, **kwargs):
 def title(msg):
     """Sets the title of the console window."""
     if sys.platform.startswith("win"):
-        ctypes.windll.kernel32.SetConsoleTitleA(msg)
+        import ctypes
+        if sys.version_info >= (3, 0):
+            ctypes.windll.kernel32.SetConsoleTitleW(msg)
+        else:
+            ctypes.windll.kernel32.SetConsoleTitleA(msg)
+    elif _use_ansi():
+        _out().write(_ESC_TITLE % (msg))
+
+def _term_size():
+    """Returns the number of columns and lines of the terminal, or 80 and 24
+    if unknown. The detected size is kept for `_SIZE_SECS` then detected
+    again (a single query of the terminal) so that resizes are picked up
+    without installing a signal handler."""
+    global _columns, _lines, _size_expires
+    from time import time
+    now = time()
+    if _columns is None or now >= _size_expires:
+        try:
+            from shutil import get_terminal_size
+            size = get_terminal_size((80, 24))
+            _columns, _lines = size.columns or 80, size.lines or 24
+        except ImportError:
+            try: _columns = int(os.environ.get("COLUMNS", 80))
+            except ValueError: _columns = 80
+            try: _lines = int(os.environ.get("LINES", 24))
+            except ValueError: _lines = 24
+        _size_expires = now + _SIZE_SECS
+    return _columns, _lines
+
+def _term_width():
+    """Returns the number of columns of the terminal, or 80 if unknown."""
+    return _term_size()[0]
+
+def _fit(width):
+    """Returns the given rule width, or `HRWIDTH` narrowed to fit the
+    terminal if None."""
+    return width or min(HRWIDTH, _term_width())
+
+def _rule(char, width):
+    """Returns a horizontal rule of the given character and width; rules
+    are cached since the same few are drawn repeatedly."""
+    key = (char, width)
+    rule = _rules.get(key)
+    if rule is None:
+        if len(_rules) >= 64:
+            _rules.clear()
+        rule = _rules[key] = getline(char, width)
+    return rule
 
 def hrule(width=None, char=None):
-    """Outputs or returns a horizontal line of the given character and width."""
-    width = width or HRWIDTH
+    """Outputs or returns a horizontal line of the given character and width.
+    The width defaults to `HRWIDTH` or the terminal width if narrower."""
+    width = _fit(width)
     char = char or HRCHAR
-    echo(getline(char, width))
+    echo(_rule(char, width))
 
 @_format_kwargs
 def wrap(body, width=None, tchar=TCHAR, bchar=BCHAR, char="", **kwargs):
-    """Wraps the given body content between horizontal lines."""
+    """Wraps the given body content between horizontal lines. The width
+    defaults to `HRWIDTH` or the terminal width if narrower.
+
+    **Params**:
+      - body (str|iter) - Content to wrap; either a value shown as a string or
+        an iterator of lines such as a file or generator. Lines are streamed
+        one at a time as they are read so output starts immediately and
+        memory use does not depend on the size of the body. Line endings are
+        optional. Other values (e.g. lists) are shown as a string as is.
+      - width (int) - Width of the horizontal lines.
+      - tchar (str) - Character of the top line.
+      - bchar (str) - Character of the bottom line.
+      - char (str) - If given, character of both lines.
+      - hdr (str) - Header shown in the top line.
+      - soft (bool) - If true, body lines longer than the width are wrapped,
+        breaking at a space where possible [default: False].
+
+    **Examples**:
+    ::
+        wrap("Done.", hdr="Status")
+        with open("build.log") as fi:
+            wrap(fi, hdr="Build log", soft=True)
+    """
     hdr = kwargs.get('hdr', "")
+    soft = kwargs.get('soft', False)
     if char:
         bchar = tchar = char
-    width = width or HRWIDTH
-    top = "/" + getline(tchar, width-1)
+    width = _fit(width)
+    top = "/" + _rule(tchar, width-1)
     if hdr:
-        top = stridxrep(top, 3, " ")
-        for i,c in enumerate(hdr):
-            top = stridxrep(top, i+4, hdr[i])
-        top = stridxrep(top, i+5, " ")
+        # Header is spliced in after the fourth character, padded by spaces.
+        top = (top[:3] + " " + hdr + " " + top[len(hdr)+5:])[:len(top)]
+    bottom = "\\" + _rule(bchar, width-1)
+    if not (hasattr(body, "readline") or _is_iterator(body)):
+        if soft:
+            body = "\n".join([part for line in ("%s" % (body,)).split("\n") for part in _soft_wrap(line, width)])
+        with _out():
+            echo(top)
+            echo(body)
+            echo(bottom)
+        return
+    from time import time
+    out = _out()
     echo(top)
-    echo(body)
-    echo("\\" + getline(bchar, width-1))
+    # Lines of seekable files are at hand so they are flushed in batches;
+    # other sources (pipes, generators) may wait for each line, so each line
+    # is flushed as soon as it is written.
+    batch = hasattr(body, "readline") and _seekable(body)
+    flushed = time()
+    for line in body:
+        if isinstance(line, bytes) and bytes is not str:
+            line = line.decode("utf-8", "replace")
+        line = ("%s" % (line,)).rstrip("\r\n")
+        if soft:
+            line = "\n".join(part for part in line.split("\n")
+                for part in _soft_wrap(part, width))
+        flush = not batch
+        if batch and time() - flushed >= _WRAP_FLUSH_SECS:
+            flush = True
+            flushed = time()
+        out.write(line + "\n", flush)
+    echo(bottom)
+
+@_format_kwargs
+def table(rows, hdr=None, sample=100, exact=False, delim=None, sep="  "):
+    """Shows the given rows as a table with aligned columns. Rows are
+    streamed: column widths are estimated from the first `sample` rows,
+    which are shown as soon as they are read, and later rows are written one
+    at a time so memory use does not depend on the number of rows. Cells
+    wider than the estimate are shown in full and push the rest of their
+    row to the right.
+
+    **Params**:
+      - rows (iter|file) - Rows of cells; either an iterable of sequences or
+        a file whose lines are split into cells at `delim`.
+      - hdr ([str]) - Column headers, underlined by a horizontal rule.
+      - sample (int) - Number of rows used to estimate the column widths.
+      - exact (bool) - If true, the column widths are measured from all rows
+        in a first pass; requires a source that can be read twice, such as a
+        list or a seekable file [default: False].
+      - delim (str) - Cell delimiter of file lines; whitespace if None.
+      - sep (str) - Separator between columns.
+
+    **Examples**:
+    ::
+        table([("web1", "10.0.0.1"), ("db1", "10.0.0.2")], hdr=["Host", "IP"])
+        with open("hosts.csv") as fi:
+            table(fi, delim=",", exact=True)
+    """
+    widths = [_text_width(h) for h in hdr or ()]
+    def measure(cells):
+        for i, cell in enumerate(cells):
+            w = _text_width(cell)
+            if i >= len(widths):
+                widths.append(w)
+            elif w > widths[i]:
+                widths[i] = w
+    head = []
+    if exact:
+        if _seekable(rows):
+            pos = rows.tell()
+            for cells in _table_cells(rows, delim):
+                measure(cells)
+            rows.seek(pos)
+        elif iter(rows) is rows:
+            raise TypeError("Exact column widths need a source that can be read twice.")
+        else:
+            for cells in _table_cells(rows, delim):
+                measure(cells)
+        cells = _table_cells(rows, delim)
+    else:
+        cells = _table_cells(rows, delim)
+        head = list(islice(cells, sample))
+        for row in head:
+            measure(row)
+    out = _out()
+    def show(cells):
+        last = len(cells) - 1
+        out.write(sep.join([c if i == last else c + " " * (widths[i] - _text_width(c))
+            for i, c in enumerate(cells)]) + "\n", False)
+    with out:
+        if hdr:
+            show(["%s" % (h,) for h in hdr])
+            out.write(_rule(HRCHAR, sum(widths) + len(sep) * (len(widths) - 1)) + "\n", False)
+        for row in head:
+            show(row)
+    del head
+    for row in cells:
+        for i in range(len(widths), len(row)):
+            widths.append(_text_width(row[i]))
+        show(row)
+    out.write("", True)
+
+def _seekable(stream):
+    """Returns true if the given object is a stream that can seek back to a
+    position; pipes and terminals cannot."""
+    seekable = getattr(stream, "seekable", None)
+    if seekable:
+        return seekable()
+    try:
+        stream.tell() # Python 2 files have no `seekable()`.
+    except (AttributeError, IOError):
+        return False
+    return True
+
+def _table_cells(rows, delim):
+    """Yields the cells of the given table rows as lists of strings; lines of
+    a file are split at the given delimiter."""
+    if hasattr(rows, "readline"):
+        for line in rows:
+            if isinstance(line, bytes) and bytes is not str:
+                line = line.decode("utf-8", "replace")
+            yield line.rstrip("\r\n").split(delim)
+    else:
+        for row in rows:
+            yield ["%s" % (c,) for c in row]
+
+def _text_width(text):
+    """Returns the number of terminal columns taken by the given text. Wide
+    East Asian characters take two columns and combining characters none;
+    the widths of non-ASCII characters are cached as they are seen."""
+    text = "%s" % (text,)
+    try:
+        text.encode("ascii")
+        return len(text)
+    except UnicodeError:
+        pass
+    width = 0
+    for c in text:
+        w = _char_widths.get(c)
+        if w is None:
+            import unicodedata
+            if unicodedata.combining(c):
+                w = 0
+            elif unicodedata.east_asian_width(c) in ("W", "F"):
+                w = 2
+            else:
+                w = 1
+            _char_widths[c] = w
+        width += w
+    return width
+
+def _is_iterator(obj):
+    """Returns true if the given object is an iterator (e.g. a generator),
+    which yields its items only once."""
+    try:
+        return iter(obj) is obj
+    except TypeError:
+        return False
+
+def _soft_wrap(line, width):
+    """Yields the given line in parts of at most `width` characters, breaking
+    at the last space of each part where possible."""
+    while len(line) > width:
+        cut = line.rfind(" ", 0, width + 1)
+        if cut > 0:
+            yield line[:cut]
+            line = line[cut+1:]
+        else:
+            yield line[:width]
+            line = line[width:]
+    yield line
 
 ##==============================================================#
 ## SECTION: Main Body                                           #
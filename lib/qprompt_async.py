@@ -0,0 +1,164 @@
+"""This library provides asyncio versions of the Qprompt user input and menu
+functions. User input is read without blocking the event loop and menu entry
+functions may be coroutine functions. Requires Python 3.5+."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import asyncio
+import functools
+import inspect
+import sys
+
+import qprompt
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+def _async_kwargs(func):
+    """Decorator that handles kwargs for coroutine functions the same way that
+    `qprompt._format_kwargs()` does for normal functions; the `session` kwarg
+    is entered while the coroutine runs."""
+    @functools.wraps(func)
+    async def inner(*args, **kwargs):
+        qprompt._rename_kwargs(kwargs)
+        session = kwargs.pop('session', None)
+        if session:
+            with session:
+                return await func(*args, **kwargs)
+        return await func(*args, **kwargs)
+    return inner
+
+async def _call(func, *args):
+    """Calls the given blocking function in the default executor so that the
+    event loop keeps running."""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+async def read(text, shw=True, session=None):
+    """Shows the given prompt text then reads and returns a line of user input
+    without blocking the event loop. Input is read from the given `session` or
+    the current session like `qprompt.Session.read()`; coroutine functions
+    are also supported as session input. Raises `EOFError` if the input
+    source is exhausted."""
+    session = session or qprompt._session()
+    if asyncio.iscoroutinefunction(session.input):
+        return await session.out().read(text, session.input)
+    if _blocking(session.input, shw):
+        return await _call(session.read, text, shw)
+    return session.read(text, shw)
+
+def _blocking(input, shw):
+    """Returns true if reading from the given session input may block, e.g.
+    waiting on a terminal or pipe."""
+    if input is None:
+        return qprompt._has_fileno(sys.stdin) or not shw
+    if isinstance(input, qprompt.Answers):
+        return input.blocking
+    if hasattr(input, "__call__"):
+        return True
+    return qprompt._has_fileno(input)
+
+async def drive(machine, session=None):
+    """Drives the given prompt state machine (e.g. `qprompt.PromptMachine`)
+    like `qprompt._drive()` but reads input without blocking the event loop;
+    returns the final answer."""
+    if session:
+        with session:
+            return await drive(machine)
+    session = qprompt._session()
+    steps = qprompt._steps(machine, session)
+    request, text = next(steps)
+    while type(request) is not qprompt.Answer:
+        request, text = steps.send(await read(text, request.shw, session))
+    return request.value
+
+async def ask_prompt(prompt, session=None):
+    """Asks the given `Prompt` until a valid answer is given, then returns
+    it. Input is read using the given `session` or the current session."""
+    return await drive(prompt.machine(), session)
+
+@_async_kwargs
+async def ask(msg="Enter input", fmt=None, dft=None, vld=None, shw=True, blk=False, hlp=None):
+    """Prompts the user for input like `qprompt.ask()` without blocking the
+    event loop."""
+    return await ask_prompt(qprompt._prompt(msg, fmt, dft, vld, shw, blk, hlp))
+
+@_async_kwargs
+async def ask_yesno(msg="Proceed?", dft=None):
+    """Prompts the user for a yes or no answer. Returns True for yes, False
+    for no."""
+    return await ask_prompt(qprompt._yesno_prompt(msg, dft)) in qprompt._YES
+
+@_async_kwargs
+async def ask_int(msg="Enter an integer", dft=None, vld=None, hlp=None):
+    """Prompts the user for an integer."""
+    return await ask_prompt(qprompt._int_prompt(msg, dft, vld, hlp))
+
+@_async_kwargs
+async def ask_float(msg="Enter a float", dft=None, vld=None, hlp=None):
+    """Prompts the user for a float."""
+    return await ask_prompt(qprompt._float_prompt(msg, dft, vld, hlp))
+
+@_async_kwargs
+async def ask_str(msg="Enter a string", dft=None, vld=None, shw=True, blk=True, hlp=None):
+    """Prompts the user for a string."""
+    return await ask_prompt(qprompt._str_prompt(msg, dft, vld, shw, blk, hlp))
+
+async def pause():
+    """Pauses and waits for user interaction like `qprompt.pause()`."""
+    session = qprompt._session()
+    if qprompt._pauses_terminal(session):
+        await _call(qprompt._pause, session)
+    else:
+        await read(qprompt._PAUSE_TEXT, False, session)
+
+async def run_func(entry):
+    """Runs the function associated with the given entry and returns its
+    result; the result is awaited if the function is a coroutine function."""
+    result = qprompt.run_func(entry)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+@_async_kwargs
+async def show_menu(entries, **kwargs):
+    """Shows a menu like `qprompt.show_menu()` without blocking the event
+    loop."""
+    returns = kwargs.get('returns', "name")
+    entry = await drive(qprompt.MenuMachine(entries, **kwargs))
+    await run_func(entry)
+    return getattr(entry, returns)
+
+@_async_kwargs
+async def show_limit(entries, **kwargs):
+    """Shows a menu like `qprompt.show_limit()` without blocking the event
+    loop."""
+    kwargs.setdefault('limit', 5)
+    return await show_menu(entries, **kwargs)
+
+async def show(menu, **kwargs):
+    """Shows the given `Menu` like `Menu.show()` without blocking the event
+    loop."""
+    return await show_menu(menu.entries, **menu._show_args(kwargs))
+
+async def main(menu, auto=None, loop=False, quit=("q", "Quit"), **kwargs):
+    """Runs the standard menu main logic for the given `Menu` like
+    `Menu.main()` without blocking the event loop."""
+    with menu._main_context(auto, quit, kwargs):
+        if loop:
+            note = "Menu loops until quit."
+            while await show(menu, note=note, **kwargs) not in quit:
+                pass
+        else:
+            note = "Menu does not loop, single entry."
+            return await show(menu, note=note, **kwargs)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    pass
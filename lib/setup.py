@@ -1,6 +1,12 @@
+import sys
 from os.path import isfile
 from setuptools import setup, find_packages
 
+# The asyncio module requires Python 3.5+.
+py_modules = ["qprompt"]
+if sys.version_info >= (3, 5):
+    py_modules.append("qprompt_async")
+
 setup(
     name = "qprompt",
     version = "0.10.0",
@@ -10,7 +16,7 @@ setup(
     license = "MIT",
     keywords = "cli menu prompt input user library",
     url = "https://github.com/jeffrimko/Qprompt",
-    py_modules=["qprompt"],
+    py_modules=py_modules,
     long_description=open("README.rst").read() if isfile("README.rst") else "",
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -0,0 +1,94 @@
+"""Tests supplying scripted user input through Answers sources."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import threading
+from testlib import *
+
+import qprompt
+from qprompt import Answers, Menu, NullWriter, Session, StdinAuto, ask, ask_int, ask_str, ask_yesno
+
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def test_answers_1(test):
+        session = Session(Answers(["foo", 42]), NullWriter())
+        test.assertEqual("foo", ask(session=session))
+        test.assertEqual(42, ask_int(session=session))
+        with test.assertRaises(EOFError):
+            ask(session=session)
+
+    def test_answers_2(test):
+        """Check that a generator is only pulled as far as needed."""
+        pulled = []
+        def gen():
+            for ans in ["x", "n", "extra"]:
+                pulled.append(ans)
+                yield ans
+        session = Session(gen(), NullWriter())
+        test.assertFalse(ask_yesno(session=session))
+        test.assertEqual(["x", "n"], pulled)
+
+    def test_answers_3(test):
+        queue = Queue()
+        def produce():
+            for ans in ["1", "2", "3", None]:
+                queue.put(ans)
+        thread = threading.Thread(target=produce)
+        thread.start()
+        session = Session(queue, NullWriter())
+        total = 0
+        try:
+            while True:
+                total += ask_int(session=session)
+        except EOFError:
+            pass
+        thread.join()
+        test.assertEqual(6, total)
+
+    def test_answers_4(test):
+        session = Session(Answers(Queue(), timeout=0.01), NullWriter())
+        with test.assertRaises(EOFError):
+            ask(session=session)
+
+    def test_answers_5(test):
+        session = Session(Answers(StringIO("foo\r\n\nbar")), NullWriter())
+        test.assertEqual("foo", ask(session=session))
+        test.assertEqual("", ask_str(session=session))
+        test.assertEqual("bar", ask(session=session))
+        with test.assertRaises(EOFError):
+            ask(session=session)
+
+    def test_answers_6(test):
+        """Check that StdinAuto does not touch stdin."""
+        stdin = sys.stdin
+        with StdinAuto(["foo", "bar"]):
+            test.assertIs(stdin, sys.stdin)
+            test.assertEqual("foo", ask())
+            test.assertEqual("bar", ask())
+        with test.assertRaises(EOFError):
+            ask()
+
+    def test_answers_7(test):
+        menu = Menu()
+        menu.add("a", "foo")
+        menu.add("b", "bar")
+        with Session(writer=NullWriter()):
+            test.assertEqual("b", menu.main(auto=["x", "b"]))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@
 
 from testlib import *
 
-from qprompt import ask_int, ask_yesno, ask_float, ask_str
+from qprompt import ask, ask_int, ask_yesno, ask_float, ask_str
 
 ##==============================================================#
 ## SECTION: Class Definitions                                   #
@@ -90,6 +90,15 @@ class TestCase(unittest.TestCase):
         result = ask_str()
         test.assertEqual("world", result)
 
+    def test_kwargs_1(test):
+        setinput("\nb")
+        result = ask(message="Pick", default="a", valid=["a", "b"])
+        test.assertEqual("a", result)
+        result = ask_str(msg="Pick", help="a or b", valid=["a", "b"])
+        test.assertEqual("b", result)
+        test.assertEqual("ask_int", ask_int.__name__)
+        test.assertIn("integer", ask_int.__doc__)
+
 ##==============================================================#
 ## SECTION: Main Body                                           #
 ##==============================================================#
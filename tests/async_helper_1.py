@@ -0,0 +1,45 @@
+"""Provides coroutine functions used by the asyncio tests; kept separate so
+that the tests can be skipped on interpreters without async syntax."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import asyncio
+import time
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+async def async_entry(results, value):
+    """Menu entry coroutine function that records the given value."""
+    await asyncio.sleep(0)
+    results.append(value)
+
+async def async_input(text):
+    """Session input coroutine function that always answers 2."""
+    await asyncio.sleep(0)
+    return "2"
+
+def slow_input(text):
+    """Session input function that blocks before answering 1."""
+    time.sleep(0.3)
+    return "1"
+
+async def count_ticks(event, ticks):
+    """Counts ticks of the event loop until the given event is set."""
+    while not event.is_set():
+        ticks.append(None)
+        await asyncio.sleep(0.01)
+
+async def run_with_ticker(coro):
+    """Runs the given coroutine alongside a ticker; returns the coroutine
+    result and the number of ticks counted while it ran."""
+    event = asyncio.Event()
+    ticks = []
+    ticker = asyncio.ensure_future(count_ticks(event, ticks))
+    result = await coro
+    event.set()
+    await ticker
+    return result, len(ticks)
@@ -0,0 +1,86 @@
+"""Tests the asyncio versions of the prompt and menu functions."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+from qprompt import Menu, Prompt, Session, Writer, enum_menu
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    import qprompt_async
+    from async_helper_1 import *
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+def run(coro):
+    """Runs the given coroutine to completion and returns its result."""
+    return asyncio.new_event_loop().run_until_complete(coro)
+
+def new_session(text):
+    """Returns a session reading the given text with output discarded."""
+    return Session(StringIO(text), Writer(StringIO()))
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+@unittest.skipIf(sys.version_info < (3, 5), "requires async syntax")
+class TestCase(unittest.TestCase):
+
+    def test_async_1(test):
+        session = new_session("foo\nbar\n42\n1.5\ny\n")
+        test.assertEqual("foo", run(qprompt_async.ask(session=session)))
+        test.assertEqual("bar", run(qprompt_async.ask_str(session=session)))
+        test.assertEqual(42, run(qprompt_async.ask_int(session=session)))
+        test.assertEqual(1.5, run(qprompt_async.ask_float(session=session)))
+        test.assertTrue(run(qprompt_async.ask_yesno(session=session)))
+        with test.assertRaises(EOFError):
+            run(qprompt_async.ask(session=session))
+
+    def test_async_2(test):
+        setinput("x\n3")
+        test.assertEqual(3, run(Prompt(vld=[int]).ask_async()))
+
+    def test_async_3(test):
+        results = []
+        menu = Menu()
+        menu.add("a", "async", async_entry, [results, "a"])
+        menu.add("b", "sync", results.append, ["b"])
+        session = new_session("a\nb\n")
+        test.assertEqual("a", run(menu.show_async(session=session)))
+        test.assertEqual("b", run(menu.show_async(session=session)))
+        test.assertEqual(["a", "b"], results)
+
+    def test_async_4(test):
+        menu = enum_menu(["item%u" % i for i in range(1, 21)])
+        session = new_session("n\n7\n")
+        result = run(qprompt_async.show_menu(menu.entries, limit=5, returns="desc", session=session))
+        test.assertEqual("item7", result)
+
+    def test_async_5(test):
+        results = []
+        menu = Menu()
+        menu.add("a", "async", async_entry, [results, "a"])
+        run(menu.main_async(auto=["a", "a", "q"], loop=True, session=new_session("")))
+        test.assertEqual(["a", "a"], results)
+
+    def test_async_6(test):
+        """Check that waiting for input does not block the event loop."""
+        session = Session(slow_input, Writer(StringIO()))
+        result, ticks = run(run_with_ticker(qprompt_async.ask_int(session=session)))
+        test.assertEqual(1, result)
+        test.assertGreater(ticks, 5)
+        session = Session(async_input, Writer(StringIO()))
+        test.assertEqual(2, run(qprompt_async.ask_int(session=session)))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
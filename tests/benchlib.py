@@ -0,0 +1,139 @@
+"""Provides a library to aid benchmarking. Benchmark scripts are named
+`*_bench_N.py` and are not run by `_Run_Tests.py`."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import gc
+import json
+import timeit
+from testlib import *
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+##==============================================================#
+## SECTION: Global Definitions                                  #
+##==============================================================#
+
+#: Seconds spent timing each case once the minimum number of ops has run;
+#: split evenly between the repeats.
+BUDGET = 0.5
+
+#: Number of times each case is timed; the best median of the repeats is
+#: compared so that a single noisy repeat does not fail the comparison.
+REPEAT = 5
+
+#: Minimum and maximum number of timed ops per case over all repeats.
+MIN_OPS = 5
+MAX_OPS = 2000
+
+#: Allowed relative slowdown of the median latency against the baseline.
+TOLERANCE = 0.5
+
+#: Slowdowns below this many microseconds are ignored as timer noise.
+NOISE_USEC = 5.0
+
+#: Allowed relative growth of peak memory against the baseline; growth below
+#: `NOISE_KB` is ignored.
+MEM_TOLERANCE = 0.25
+NOISE_KB = 16.0
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+def percentile(values, pct):
+    """Returns the given percentile of the sorted list of values."""
+    idx = int(round((pct / 100.0) * (len(values) - 1)))
+    return values[idx]
+
+def measure(func, budget=BUDGET, min_ops=MIN_OPS, max_ops=MAX_OPS, repeat=REPEAT):
+    """Times repeated calls of the given function in `repeat` rounds. Returns
+    a dict with the number of ops, throughput in ops per second and the
+    latency percentiles in microseconds; the median is the best of the
+    rounds (like `timeit.repeat()`) while the other percentiles are those of
+    the median round."""
+    rounds = [_measure_round(func, budget / repeat, max(1, min_ops // repeat), max(1, max_ops // repeat))
+            for _ in range(repeat)]
+    ops = sum(len(times) for times in rounds)
+    total = sum(sum(times) for times in rounds)
+    rounds.sort(key=lambda times: percentile(times, 50))
+    middle = rounds[len(rounds) // 2]
+    return {
+        "ops": ops,
+        "ops_per_sec": ops / total if total else 0.0,
+        "p50_us": 1e6 * percentile(rounds[0], 50),
+        "p90_us": 1e6 * percentile(middle, 90),
+        "p99_us": 1e6 * percentile(middle, 99),
+        }
+
+def _measure_round(func, budget, min_ops, max_ops):
+    """Returns the sorted times of repeated calls of the given function."""
+    timer = timeit.default_timer
+    times = []
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        total = 0.0
+        while len(times) < max_ops and (len(times) < min_ops or total < budget):
+            start = timer()
+            func()
+            took = timer() - start
+            times.append(took)
+            total += took
+    finally:
+        if enabled:
+            gc.enable()
+    times.sort()
+    return times
+
+def peak_kb(func):
+    """Returns the peak memory in KB allocated by a single call of the given
+    function, or None if `tracemalloc` is not available."""
+    if not tracemalloc:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak / 1024.0
+
+def load_baseline(path):
+    """Returns the results stored in the given baseline file, or None if the
+    file does not exist."""
+    if not op.isfile(path):
+        return None
+    with open(path) as fi:
+        return json.load(fi)
+
+def save_baseline(path, results):
+    """Stores the given results as the baseline."""
+    with open(path, "w") as fo:
+        json.dump(results, fo, indent=2, sort_keys=True)
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Compares the given results against the baseline. Returns a list of
+    regression messages; cases missing from the baseline are skipped."""
+    regressions = []
+    for key in sorted(results):
+        new = results[key]
+        old = baseline.get(key)
+        if not old:
+            continue
+        slower = new['p50_us'] - old['p50_us']
+        if slower > NOISE_USEC and new['p50_us'] > old['p50_us'] * (1 + tolerance):
+            regressions.append("%s: p50 %.1fus -> %.1fus" % (key, old['p50_us'], new['p50_us']))
+        if new.get('peak_kb') is None or old.get('peak_kb') is None:
+            continue
+        grown = new['peak_kb'] - old['peak_kb']
+        if grown > NOISE_KB and new['peak_kb'] > old['peak_kb'] * (1 + MEM_TOLERANCE):
+            regressions.append("%s: peak %.1fKB -> %.1fKB" % (key, old['peak_kb'], new['peak_kb']))
+    return regressions
@@ -0,0 +1,114 @@
+"""Benchmarks file-backed menus: building and loading the line offset index
+and paging through a `FileEntries` menu with scripted input.
+
+Usage:
+  python file_bench_1.py [--max-lines N]
+"""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import argparse
+import shutil
+import tempfile
+from functools import partial
+from benchlib import *
+
+import qprompt
+from qprompt import FileEntries, Menu, NullWriter, Session
+
+##==============================================================#
+## SECTION: Global Definitions                                  #
+##==============================================================#
+
+#: Line counts of the generated files.
+SIZES = [10000, 100000, 1000000, 10000000]
+
+#: Entries shown per page.
+LIMIT = 20
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+def gen_file(path, lines):
+    """Writes a file of hostname-like lines."""
+    with open(path, "w") as fo:
+        for start in range(0, lines, 100000):
+            fo.write("".join("host-%08u.example.com\n" % i for i in range(start, min(lines, start + 100000))))
+
+def build_index(path):
+    """Builds the line offset index from scratch."""
+    if op.isfile(path + ".qpidx"):
+        os.remove(path + ".qpidx")
+    FileEntries(path).close()
+
+def load_index(path):
+    """Opens the file using the saved index."""
+    FileEntries(path).close()
+
+def paging(entries, answers):
+    """Returns a function showing the menu with the given answers."""
+    menu = Menu(entries)
+    def inner():
+        return menu.show(limit=LIMIT, returns="desc", session=Session(answers))
+    return inner
+
+def row(name, lines, result):
+    """Prints a row of results."""
+    print("%-14s %10u %6u %12.1f %12.1f %12.1f %10s" % (
+        name, lines, result['ops'], result['ops_per_sec'], result['p50_us'], result['p99_us'],
+        "-" if result.get('peak_kb') is None else "%.1f" % result['peak_kb']))
+    sys.stdout.flush()
+
+def run_bench(max_lines):
+    """Prints the cost of each operation for each file size."""
+    tmpdir = tempfile.mkdtemp()
+    prev = qprompt.set_writer(NullWriter())
+    try:
+        print("%-14s %10s %6s %12s %12s %12s %10s" % (
+            "case", "lines", "ops", "ops/s", "p50 us", "p99 us", "peak KB"))
+        for lines in SIZES:
+            if lines > max_lines:
+                break
+            path = op.join(tmpdir, "lines_%u.txt" % lines)
+            gen_file(path, lines)
+            build = partial(build_index, path)
+            result = measure(build, budget=1.0, min_ops=3, max_ops=20)
+            result['peak_kb'] = peak_kb(build)
+            row("build index", lines, result)
+            load = partial(load_index, path)
+            result = measure(load, min_ops=3)
+            result['peak_kb'] = peak_kb(load)
+            row("load index", lines, result)
+            entries = FileEntries(path)
+            mid = (lines // LIMIT) // 2
+            cases = [
+                ("first page", ["1"]),
+                ("last page", ["l", str(lines)]),
+                ("goto page", ["g", str(mid + 1), str(mid * LIMIT + 1)]),
+                ]
+            for name, answers in cases:
+                func = paging(entries, answers)
+                result = measure(func)
+                result['peak_kb'] = peak_kb(func)
+                row(name, lines, result)
+            name = str(lines)
+            result = measure(lambda: entries.names.get(name))
+            row("lookup", lines, result)
+            entries.close()
+            os.remove(path)
+    finally:
+        qprompt.set_writer(prev)
+        shutil.rmtree(tmpdir)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--max-lines", type=int, default=SIZES[2],
+            help="largest file to generate, in lines")
+    run_bench(parser.parse_args().max_lines)
@@ -0,0 +1,102 @@
+"""Tests menus backed by the lines of a text file."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import shutil
+import tempfile
+from testlib import *
+
+from qprompt import FileEntries, Menu, NullWriter, Session
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.tmpdir = tempfile.mkdtemp()
+        test.path = op.join(test.tmpdir, "hosts.txt")
+        test.write(b"alpha\nbeta\r\ngamma\n\ndelta")
+        test.opened = []
+
+    def tearDown(test):
+        for entries in test.opened:
+            entries.close()
+        shutil.rmtree(test.tmpdir)
+
+    def write(test, data):
+        with open(test.path, "wb") as fo:
+            fo.write(data)
+
+    def open(test, **kwargs):
+        entries = FileEntries(test.path, **kwargs)
+        test.opened.append(entries)
+        return entries
+
+    def test_file_1(test):
+        entries = test.open()
+        test.assertEqual(5, len(entries))
+        test.assertEqual(["alpha", "beta", "gamma", "", "delta"], [e.desc for e in entries])
+        test.assertEqual("5", entries[-1].name)
+        test.assertEqual(2, entries.find("3"))
+        test.assertEqual(-1, entries.find("6"))
+        test.assertEqual(-1, entries.find("03"))
+
+    def test_file_2(test):
+        """Check that the saved index is reused until the file changes."""
+        test.open()
+        test.assertTrue(op.isfile(test.path + ".qpidx"))
+        entries = test.open()
+        test.assertEqual("gamma", entries[2].desc)
+        if hasattr(memoryview, "cast"):
+            test.assertIsInstance(entries._offsets, memoryview)
+        test.write(b"one\ntwo\n")
+        entries = test.open()
+        test.assertEqual(["one", "two"], [e.desc for e in entries])
+
+    def test_file_3(test):
+        test.write(b"")
+        entries = test.open(idxpath=op.join(test.tmpdir, "nodir", "x.qpidx"))
+        test.assertEqual(0, len(entries))
+        test.assertEqual([], list(entries))
+
+    def test_file_4(test):
+        menu = Menu(test.open())
+        menu.add("q", "Quit")
+        test.assertEqual("Quit", menu.get("q").desc)
+        test.assertEqual(["1", "2", "3", "4", "5", "q"], list(menu.entries.names))
+        with test.assertRaises(TypeError):
+            menu.remove("2")
+        menu.remove("q")
+        test.assertEqual(5, len(menu.entries))
+
+    def test_file_5(test):
+        menu = Menu(test.open())
+        session = Session(["n", "g", "3", "5"], NullWriter())
+        result = menu.show(limit=2, returns="desc", session=session)
+        test.assertEqual("delta", result)
+        result = menu.show(returns="desc", session=Session(["2"], NullWriter()))
+        test.assertEqual("beta", result)
+
+    def test_file_6(test):
+        """Check that file menus are searched without indexing the lines."""
+        entries = test.open()
+        menu = Menu(entries)
+        result = menu.show(limit=2, returns="desc", session=Session(["/amm", "3"], NullWriter()))
+        test.assertEqual("gamma", result)
+        test.assertFalse(hasattr(entries._search, "texts"))
+        test.assertEqual([4], list(entries._search.find("d")))
+        test.assertEqual([0], list(entries._search.find("a")))
+        test.assertEqual([4], entries._search.rank("delt", 3))
+        result = menu.show(limit=2, fuzzy=True, returns="desc", session=Session(["bta", "2"], NullWriter()))
+        test.assertEqual("beta", result)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Tests that importing the library stays fast by checking which modules it
+loads; also reports how long the import takes (via `-X importtime`)."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+##==============================================================#
+## SECTION: Global Definitions                                  #
+##==============================================================#
+
+#: Modules that must only be imported when first used.
+LAZY = ["asyncio", "copy", "ctypes", "getpass", "random", "string", "subprocess"]
+
+#: Script run in a fresh interpreter that prints the newly loaded modules.
+SCRIPT = "import sys; old = set(sys.modules); import qprompt; print(' '.join(set(sys.modules) - old))"
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+def run_python(*args):
+    """Runs a fresh interpreter with the library directory on the path and
+    returns the stdout and stderr output."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = libdir
+    proc = subprocess.Popen([sys.executable] + list(args), env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    return proc.communicate()
+
+def import_usec():
+    """Returns the cumulative import time of the library in microseconds as
+    reported by `-X importtime`."""
+    _, err = run_python("-X", "importtime", "-c", "import qprompt")
+    for line in err.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == "qprompt":
+            return int(fields[1])
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def test_import_1(test):
+        out, _ = run_python("-c", SCRIPT)
+        loaded = out.split()
+        test.assertIn("qprompt", loaded)
+        for name in LAZY:
+            test.assertNotIn(name, loaded)
+
+    @unittest.skipIf(sys.version_info < (3, 7), "requires -X importtime")
+    def test_import_2(test):
+        """Reports the import time; not checked against a limit since it
+        depends on the machine and on whether bytecode is cached."""
+        usec = import_usec()
+        test.assertIsNotNone(usec)
+        print("[INFO] qprompt import time: %u us" % (usec))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Benchmarks the per-call overhead of the `_format_kwargs()` decorator
+against the original (`0.10.0`) implementation."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import timeit
+from testlib import *
+
+import qprompt
+
+##==============================================================#
+## SECTION: Global Definitions                                  #
+##==============================================================#
+
+#: Number of calls timed per case.
+NUMBER = 200000
+
+#: Number of times each case is repeated; the best time is reported.
+REPEAT = 7
+
+#: Calls to time; name and kwargs.
+CASES = [
+    ("no kwargs", {}),
+    ("short", {'msg': "Enter", 'dft': 1}),
+    ("aliased", {'message': "Enter", 'default': 1}),
+    ]
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+def legacy_format_kwargs(func):
+    """The _format_kwargs() decorator as found in `0.10.0`."""
+    def inner(*args, **kwargs):
+        for k in qprompt._KWARG_FORMATS.keys():
+            for v in qprompt._KWARG_FORMATS[k]:
+                if v in kwargs:
+                    kwargs[k] = kwargs[v]
+                    kwargs.pop(v)
+        session = kwargs.pop('session', None)
+        if session:
+            with session:
+                return func(*args, **kwargs)
+        return func(*args, **kwargs)
+    return inner
+
+def target(msg="Enter input", dft=None, vld=None):
+    """Stands in for a decorated library function."""
+    return msg
+
+def nsec(funcs, kwargs):
+    """Returns the best average nanoseconds per call of each of the given
+    functions; the functions are timed in turn to even out timer drift."""
+    best = [None] * len(funcs)
+    for _ in range(REPEAT):
+        for i, func in enumerate(funcs):
+            took = 1e9 * timeit.timeit(lambda: func(**kwargs), number=NUMBER) / NUMBER
+            best[i] = took if best[i] is None else min(best[i], took)
+    return best
+
+def run_bench():
+    """Prints the per-call overhead of each decorator over a plain call."""
+    legacy = legacy_format_kwargs(target)
+    current = qprompt._format_kwargs(target)
+    print("%-10s %10s %12s %12s" % ("case", "plain ns", "legacy +ns", "current +ns"))
+    for name, kwargs in CASES:
+        plain = dict((qprompt._KWARG_ALIASES.get(k, k), v) for k, v in kwargs.items())
+        base = nsec([target], plain)[0]
+        old, new = nsec([legacy, current], kwargs)
+        print("%-10s %10.1f %12.1f %12.1f" % (name, base, old - base, new - base))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    run_bench()
@@ -0,0 +1,64 @@
+"""Tests driving the prompt and menu state machines directly."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+from qprompt import Answer, Clear, MenuMachine, Prompt, PromptMachine, Read, Render, enum_menu
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def test_machine_1(test):
+        machine = PromptMachine(Prompt("Number", vld=[int], hlp="any"))
+        test.assertEqual([Read("Number", True)], machine.start())
+        events = machine.feed("?")
+        test.assertEqual(Render, type(events[0]))
+        test.assertIn("<int>", events[0].text)
+        test.assertEqual(Read("Number", True), events[1])
+        test.assertEqual([Read("Number", True)], machine.feed("foo"))
+        test.assertEqual([Answer(3)], machine.feed("3"))
+
+    def test_machine_2(test):
+        machine = PromptMachine(Prompt(dft="foo", vld=["foo", "bar"], shw=False))
+        test.assertEqual([Read("Enter input [foo]", False)], machine.start())
+        test.assertEqual([Answer("foo")], machine.feed(""))
+
+    def test_machine_3(test):
+        menu = enum_menu(["foo", "bar"])
+        machine = MenuMachine(menu.entries, hdr="hi", note="pick", clear=True)
+        events = machine.start()
+        test.assertEqual(Clear(), events[0])
+        test.assertEqual(Render("-- MENU: hi --\n  (1) foo\n  (2) bar\n"), events[1])
+        test.assertEqual(Render("[!] pick\n"), events[2])
+        test.assertEqual(Read("Enter menu selection", True), events[3])
+        test.assertEqual([Read("Enter menu selection", True)], machine.feed("3"))
+        events = machine.feed("2")
+        test.assertEqual(1, len(events))
+        test.assertEqual("bar", events[0].value.desc)
+
+    def test_machine_4(test):
+        menu = enum_menu(["item%u" % i for i in range(1, 51)])
+        machine = MenuMachine(menu.entries, limit=10, compact=True)
+        test.assertEqual(5, machine.npages())
+        machine.start()
+        test.assertEqual(Read("Enter menu selection", True), machine.feed("n")[-1])
+        test.assertEqual(1, machine.ipage)
+        test.assertEqual([Read("Enter page number", True)], machine.feed("g"))
+        test.assertEqual([Read("Enter page number", True)], machine.feed("6"))
+        machine.feed("4")
+        test.assertEqual(3, machine.ipage)
+        events = machine.feed("35")
+        test.assertEqual("item35", events[-1].value.desc)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Tests the compact MenuEntries storage of menus."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import copy
+import pickle
+from testlib import *
+
+from qprompt import Menu, MenuEntries, MenuEntry, Prompt, enum_menu
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.menu = enum_menu(["foo", "bar", "baz"])
+
+    def test_entries_1(test):
+        entries = test.menu.entries
+        test.assertEqual(3, len(entries))
+        test.assertEqual(MenuEntry("2", "bar", None, (), {}), entries[1])
+        test.assertEqual(["1", "2", "3"], [e.name for e in entries])
+        test.assertIs(entries[0].args, entries[2].args)
+        test.assertIsNot(entries[0].krgs, entries[2].krgs)
+        test.assertEqual("baz", test.menu.get("3").desc)
+        test.assertEqual(None, test.menu.get("03"))
+        test.assertEqual(None, test.menu.get("4"))
+
+    def test_entries_2(test):
+        test.menu.insert(1, "x", "new")
+        test.assertEqual(["1", "x", "2", "3"], [e.name for e in test.menu.entries])
+        test.assertEqual("baz", test.menu.get("3").desc)
+        test.menu.remove("2")
+        test.assertEqual(["1", "x", "3"], [e.name for e in test.menu.entries])
+        test.assertEqual(None, test.menu.get("2"))
+        test.assertEqual("baz", test.menu.get("3").desc)
+
+    def test_entries_3(test):
+        test.menu.add("q", "Quit")
+        test.menu.enum("qux")
+        test.assertEqual("5", test.menu.entries[-1].name)
+        test.assertEqual("Quit", test.menu.get("q").desc)
+        del test.menu.entries[-1]
+        test.assertEqual(None, test.menu.get("5"))
+        test.menu.update("1", desc="first", args=[1])
+        test.assertEqual(MenuEntry("1", "first", None, [1], {}), test.menu.get("1"))
+        test.menu.entries[0] = MenuEntry("z", "zed", None, (), {})
+        test.assertEqual(None, test.menu.get("1"))
+        test.assertEqual("zed", test.menu.get("z").desc)
+
+    def test_entries_4(test):
+        """Check that duplicate names resolve to the first entry."""
+        test.menu.add("2", "dup")
+        test.assertEqual("bar", test.menu.get("2").desc)
+        test.menu.remove("2")
+        test.assertEqual("dup", test.menu.get("2").desc)
+
+    def test_entries_5(test):
+        """Check that plain lists are converted."""
+        test.menu.entries = [MenuEntry("a", "foo", None, None, None)]
+        test.assertEqual("foo", test.menu.get("a").desc)
+        test.assertIsInstance(test.menu.entries, MenuEntries)
+        test.assertEqual(None, test.menu.entries[0].args)
+
+    def test_entries_6(test):
+        prompt = Prompt(vld=test.menu.entries.names)
+        test.assertEqual("[HELP] Valid input: 1 | 2 | 3\n", prompt.help_text())
+        test.assertEqual("2", prompt.check("2"))
+        test.assertEqual(None, prompt.check("0"))
+        setinput("3")
+        test.assertEqual("baz", test.menu.show(returns="desc"))
+
+    @unittest.skipIf(not tracemalloc, "Requires tracemalloc.")
+    def test_entries_7(test):
+        """Check that enumerated entries are stored compactly."""
+        descs = ["entry"] * 10000
+        tracemalloc.start()
+        entries = [MenuEntry(str(i+1), d, None, [], {}) for i, d in enumerate(descs)]
+        legacy = tracemalloc.get_traced_memory()[0]
+        del entries
+        tracemalloc.stop()
+        tracemalloc.start()
+        menu = enum_menu(descs)
+        compact = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        test.assertLess(compact * 10, legacy)
+
+    def test_entries_8(test):
+        """Check that entries behave like the list they replaced."""
+        entries = test.menu.entries
+        test.assertEqual([MenuEntry("1", "foo", None, (), {}), MenuEntry("2", "bar", None, (), {}),
+            MenuEntry("3", "baz", None, (), {})], entries)
+        copy = entries.copy()
+        test.assertEqual(entries, copy)
+        entries.sort(key=lambda e: e.desc)
+        test.assertEqual(["bar", "baz", "foo"], [e.desc for e in entries])
+        test.assertEqual("foo", test.menu.get("1").desc)
+        test.assertNotEqual(entries, copy)
+        entries[0:1] = [MenuEntry("x", "new", None, (), {}), MenuEntry("y", "two", None, (), {})]
+        test.assertEqual(["x", "y", "3", "1"], [e.name for e in entries])
+        test.assertEqual("two", test.menu.get("y").desc)
+        entries[::2] = [MenuEntry("a", "A", None, (), {}), MenuEntry("b", "B", None, (), {})]
+        test.assertEqual(["a", "y", "b", "1"], [e.name for e in entries])
+        with test.assertRaises(ValueError):
+            entries[::2] = []
+        test.assertEqual(["foo", "bar", "baz"], [e.desc for e in copy])
+
+    def test_entries_9(test):
+        """Check that entries without arguments can be copied and pickled."""
+        test.menu.add("k", "krgs", krgs={"a": 1})
+        for entry in test.menu.entries:
+            test.assertEqual(entry, copy.deepcopy(entry))
+            test.assertEqual(entry, pickle.loads(pickle.dumps(entry)))
+        test.menu.entries[0].krgs["a"] = 1
+        test.assertEqual({}, test.menu.entries[0].krgs)
+        test.assertEqual({}, test.menu.entries[1].krgs)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
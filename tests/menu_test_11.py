@@ -0,0 +1,98 @@
+"""Tests menus built from lazy entry sources."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+from qprompt import Menu, MenuEntry, enum_menu
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.pulled = 0
+        test.menu = enum_menu(test.items(100))
+
+    def items(test, total):
+        """Yields entry descriptions and counts how many were pulled."""
+        for i in range(1, total + 1):
+            test.pulled = i
+            yield "item%u" % i
+
+    def test_lazy_1(test):
+        test.assertEqual(0, test.pulled)
+        result = show_answers(test.menu, ["n", "13"], limit=10, returns="desc")
+        test.assertEqual("item13", result)
+        test.assertEqual(21, test.pulled)
+        test.assertTrue(test.menu.entries.pending)
+
+    def test_lazy_2(test):
+        result = show_answers(test.menu, ["l", "100"], limit=10, returns="desc")
+        test.assertEqual("item100", result)
+        test.assertFalse(test.menu.entries.pending)
+
+    def test_lazy_3(test):
+        """Check that page numbers are validated by pulling only as needed."""
+        result = show_answers(test.menu, ["g", "5", "45"], limit=10, returns="desc")
+        test.assertEqual("item45", result)
+        test.assertEqual(51, test.pulled)
+        with test.assertRaises(EOFError):
+            show_answers(test.menu, ["g", "11"], limit=10)
+        test.assertEqual(100, test.pulled)
+
+    def test_lazy_4(test):
+        test.assertEqual("item7", test.menu.get("7").desc)
+        test.assertEqual(7, test.pulled)
+        test.assertEqual(None, test.menu.get("x"))
+        test.assertEqual(7, test.pulled)
+        test.assertEqual("item10", test.menu.entries[9].desc)
+        test.assertEqual(10, test.pulled)
+        test.assertEqual(100, len(test.menu.entries))
+
+    def test_lazy_5(test):
+        """Check that adding entries keeps the enumerated names in order."""
+        test.menu.add("q", "Quit")
+        test.assertEqual(100, test.pulled)
+        test.assertEqual(["99", "100", "q"], [e.name for e in test.menu.entries[-3:]])
+
+    def test_lazy_6(test):
+        """Check that the last page of a short source is shown."""
+        test.menu = enum_menu(test.items(12))
+        result = show_answers(test.menu, ["n", "n", "12"], limit=5, returns="desc")
+        test.assertEqual("item12", result)
+
+    def test_lazy_7(test):
+        entries = (MenuEntry(c, c.upper(), None, None, None) for c in "abcdef")
+        test.menu = Menu(entries)
+        test.assertTrue(test.menu.entries.pending)
+        test.assertEqual("D", test.menu.get("d").desc)
+        result = show_answers(test.menu, ["c"], limit=3, returns="desc")
+        test.assertEqual("C", result)
+
+    def test_lazy_8(test):
+        """Check that the quit entry of main() does not pull the source."""
+        def forever():
+            i = 0
+            while True:
+                i += 1
+                test.pulled = i
+                yield "item%u" % i
+        test.menu = enum_menu(forever())
+        test.assertEqual("7", show_answers(test.menu, ["n", "7"], main=True, limit=5))
+        test.assertEqual(11, test.pulled)
+        test.menu = enum_menu(test.items(3))
+        for answers in (["1"], ["n", "q"]):
+            test.assertEqual(answers[-1], show_answers(test.menu, answers, main=True, limit=3))
+        test.assertEqual(["1", "2", "3", "q"], [e.name for e in test.menu.entries])
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
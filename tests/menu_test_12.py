@@ -0,0 +1,84 @@
+"""Tests searching the entries of paged menus."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+from qprompt import Menu, enum_menu
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        hosts = ["host-%u rack %u" % (i, i % 4) for i in range(100)]
+        test.menu = enum_menu(hosts, limit=5, returns="desc")
+
+    def test_search_1(test):
+        result = show_answers(test.menu, ["/host-4", "/host-49", "50"])
+        test.assertEqual("host-49 rack 1", result)
+        result = show_answers(test.menu, ["/HOST-7", "n", "n", "80"])
+        test.assertEqual("host-79 rack 3", result)
+
+    def test_search_2(test):
+        """Check that short queries match the start of words."""
+        result = show_answers(test.menu, ["/r", "n", "n", "13"])
+        test.assertEqual("host-12 rack 0", result)
+        index = test.menu.entries._search
+        test.assertEqual([0, 4, 8], list(index.find("0"))[:3])
+        test.assertEqual(list(range(0, 100, 4)), list(index.find("rack 0")))
+
+    def test_search_3(test):
+        """Check that an empty query shows all entries again."""
+        result = show_answers(test.menu, ["/rack 3", "/", "n", "7"])
+        test.assertEqual("host-6 rack 2", result)
+        result = show_answers(test.menu, ["/nothing", "/", "1"])
+        test.assertEqual("host-0 rack 0", result)
+
+    def test_search_4(test):
+        """Check that names starting with a slash are still selectable."""
+        test.menu.add("/q", "Quit")
+        test.assertEqual("Quit", show_answers(test.menu, ["/q"], limit=200))
+        test.assertEqual("Quit", show_answers(test.menu, ["/quit", "/q"]))
+
+    def test_search_5(test):
+        """Check that the search index is rebuilt after the entries change."""
+        show_answers(test.menu, ["/host-9", "10"])
+        index = test.menu.entries._search
+        show_answers(test.menu, ["/host-8", "9"])
+        test.assertIs(index, test.menu.entries._search)
+        test.menu.add("x", "extra host-999")
+        test.assertEqual("extra host-999", show_answers(test.menu, ["/host-999", "x"]))
+        test.assertIsNot(index, test.menu.entries._search)
+
+    def test_search_6(test):
+        """Check that results are only checked as far as they are shown."""
+        show_answers(test.menu, ["/host", "2"])
+        found = test.menu.entries._search.find("host")
+        test.assertTrue(found.pending)
+        test.assertEqual(100, len(found))
+        test.assertFalse(found.pending)
+
+    def test_search_7(test):
+        """Check that search is only offered for paged menus."""
+        menu = Menu()
+        menu.add("1", "one")
+        with test.assertRaises(EOFError):
+            show_answers(menu, ["/one"])
+
+    def test_search_8(test):
+        """Check that only searches are accepted when nothing matches."""
+        with test.assertRaises(EOFError):
+            show_answers(test.menu, ["/zzz", "foo", "1"])
+        test.assertEqual("host-1 rack 1", show_answers(test.menu, ["/zzz", "foo", "/", "2"]))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
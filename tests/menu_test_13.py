@@ -0,0 +1,72 @@
+"""Tests fuzzy matching of menu input against the entries."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+from qprompt import Menu, enum_menu
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.menu = Menu(returns="desc")
+        for name, desc in [("a", "apple"), ("b", "banana"), ("c", "cherry"), ("g", "grape"), ("p", "pineapple")]:
+            test.menu.add(name, desc)
+
+    def test_fuzzy_1(test):
+        out = StringIO()
+        result = show_answers(test.menu, ["bananna", "b"], out, fuzzy=True)
+        test.assertEqual("banana", result)
+        test.assertIn("[!] Closest matches to `bananna`", out.getvalue())
+        shown = out.getvalue().split("Closest")[0].split("-- MENU --")[-1]
+        test.assertIn("(b) banana", shown)
+        test.assertNotIn("(c) cherry", shown)
+
+    def test_fuzzy_2(test):
+        """Check that matches are ranked best first."""
+        index = test.menu.entries._search
+        test.assertEqual(None, index)
+        show_answers(test.menu, ["aple", "a"], fuzzy=2)
+        index = test.menu.entries._search
+        test.assertEqual([0, 4], index.rank("apple", 5))
+        test.assertEqual([0], index.rank("apple", 1))
+        test.assertEqual([3], index.rank("GRAPE", 1))
+        test.assertEqual([], index.rank("zzz", 3))
+
+    def test_fuzzy_3(test):
+        """Check that all entries are selectable while matches are shown."""
+        test.assertEqual("cherry", show_answers(test.menu, ["chery", "c"], fuzzy=True))
+        test.assertEqual("grape", show_answers(test.menu, ["apple", "/", "g"], fuzzy=True))
+
+    def test_fuzzy_4(test):
+        """Check that unmatched input is only fuzzy matched if enabled."""
+        with test.assertRaises(EOFError):
+            show_answers(test.menu, ["chery"])
+        test.assertEqual("cherry", show_answers(test.menu, ["", "?", "c"], fuzzy=True))
+
+    def test_fuzzy_5(test):
+        test.menu = enum_menu(["host-%u" % i for i in range(1000)], returns="desc")
+        result = show_answers(test.menu, ["hots-512", "n", "513"], fuzzy=3, limit=2)
+        test.assertEqual("host-512", result)
+
+    def test_fuzzy_6(test):
+        """Check that all entries stay shown if nothing is close."""
+        test.menu = enum_menu(["foo", "bar", "baz", "qux"], returns="desc")
+        out = StringIO()
+        result = show_answers(test.menu, ["qqqqq", "n", "4"], out, fuzzy=True, limit=3)
+        test.assertEqual("qux", result)
+        test.assertIn("[!] No close matches to `qqqqq`.", out.getvalue())
+        test.assertEqual("bar", show_answers(test.menu, ["qqqqq", "2"], fuzzy=True))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
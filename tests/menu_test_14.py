@@ -0,0 +1,87 @@
+"""Tests that Menu objects reuse their rendered banner."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+import qprompt
+from qprompt import Menu, MenuEntry, NullWriter, Session, Writer, show_menu
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.rendered = 0
+        test.orig = qprompt._menu_banner
+        def counted(entries, hdr=""):
+            test.rendered += 1
+            return test.orig(entries, hdr)
+        qprompt._menu_banner = counted
+        test.menu = Menu(hdr="Fruit")
+        test.menu.add("a", "apple")
+        test.menu.add("b", "banana")
+
+    def tearDown(test):
+        qprompt._menu_banner = test.orig
+
+    def test_frames_1(test):
+        first, second = StringIO(), StringIO()
+        show_answers(test.menu, ["a"], first)
+        show_answers(test.menu, ["b"], second)
+        test.assertEqual(first.getvalue(), second.getvalue())
+        test.assertEqual(1, test.rendered)
+        test.assertIn("-- MENU: Fruit --\n  (a) apple\n  (b) banana\n", first.getvalue())
+
+    def test_frames_2(test):
+        """Check that the banner is rendered again after changes."""
+        show_answers(test.menu, ["a"])
+        test.menu.add("c", "cherry")
+        out = StringIO()
+        show_answers(test.menu, ["c"], out)
+        test.menu.update("a", desc="apricot")
+        show_answers(test.menu, ["a"], out)
+        show_answers(test.menu, ["a"], out, hdr="Other")
+        test.assertIn("(c) cherry", out.getvalue())
+        test.assertIn("(a) apricot", out.getvalue())
+        test.assertIn("-- MENU: Other --", out.getvalue())
+        test.assertEqual(4, test.rendered)
+        show_answers(test.menu, ["a"], hdr="Other")
+        test.assertEqual(4, test.rendered)
+
+    def test_frames_3(test):
+        """Check that the menu is redrawn as a single write."""
+        writes = []
+        class Counted(Writer):
+            def write(self, text, flush=True):
+                writes.append(text)
+        test.menu.show(session=Session(["a"], Counted()))
+        test.menu.show(session=Session(["a"], Counted()))
+        test.assertEqual(4, len(writes))
+        test.assertEqual(writes[0], writes[2])
+        test.assertIn("(b) banana", writes[0])
+
+    def test_frames_4(test):
+        """Check that show options are not deep copied."""
+        vld = ["a"]
+        menu = Menu(note=vld)
+        test.assertIs(vld, menu._show_args({})['note'])
+
+    def test_frames_5(test):
+        """Check that plain lists of entries are shown but not cached."""
+        frames = {}
+        entries = [MenuEntry("a", "apple", None, None, None)]
+        result = show_menu(entries, frames=frames, returns="desc", session=Session(["a"], NullWriter()))
+        test.assertEqual("apple", result)
+        test.assertEqual({}, frames)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Tests redrawing menus in place."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+import qprompt
+from qprompt import Menu, echo
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.ansi = qprompt._ansi
+        test.size = qprompt._columns, qprompt._lines, qprompt._size_expires
+        qprompt._size_expires = float("inf")
+        qprompt._ansi = True
+        qprompt._columns, qprompt._lines = 80, 50
+        test.menu = Menu()
+        for i in range(30):
+            test.menu.add(str(i), "item %u" % i)
+        test.out = TtyStream()
+
+    def tearDown(test):
+        qprompt._ansi = test.ansi
+        qprompt._columns, qprompt._lines, qprompt._size_expires = test.size
+
+    def test_redraw_1(test):
+        """Check that only changed lines are sent when paging."""
+        result = show_answers(test.menu, ["n", "15"], test.out, limit=10, redraw=True)
+        test.assertEqual("15", result)
+        text = test.out.getvalue()
+        test.assertEqual(1, text.count("-- MENU --"))
+        redraw = text.split("\r\x1b[14A")[1]
+        test.assertTrue(redraw.startswith("\x1b[1B"))
+        test.assertIn("\x1b[2K  (10) item 10\n", redraw)
+        test.assertNotIn("(0) item 0", redraw)
+
+    def test_redraw_2(test):
+        """Check that a looping menu is redrawn without resending it."""
+        def func():
+            echo("done")
+        test.menu.update("3", func=func)
+        show_answers(test.menu, ["3", "1", "q"], test.out, main=True, loop=True, redraw=True)
+        frames = test.out.getvalue().split("[?] Enter menu selection: ")
+        test.assertEqual(4, len(frames))
+        test.assertIn("(29) item 29", frames[0])
+        test.assertEqual("done\n\r\x1b[34A\x1b[33B\x1b[J", frames[1])
+        test.assertEqual("\r\x1b[33A\x1b[33B\x1b[J", frames[2])
+
+    def test_redraw_3(test):
+        """Check that help and invalid input are accounted for."""
+        show_answers(test.menu, ["x", "?", "n", "11"], test.out, limit=10, redraw=True)
+        test.assertIn("\r\x1b[15A", test.out.getvalue())
+
+    def test_redraw_4(test):
+        """Check that menus are painted in full without ANSI support."""
+        qprompt._ansi = False
+        show_answers(test.menu, ["n", "11"], test.out, limit=10, redraw=True)
+        test.assertEqual(2, test.out.getvalue().count("-- MENU --"))
+        test.assertNotIn("\x1b", test.out.getvalue())
+
+    def test_redraw_5(test):
+        """Check that input echoed by the terminal is accounted for."""
+        answers = ["n", "11"]
+        show_answers(test.menu, lambda _: answers.pop(0), test.out, limit=10, redraw=True)
+        test.assertIn("\r\x1b[15A", test.out.getvalue())
+
+    def test_redraw_6(test):
+        """Check that a frame taller than the terminal is painted in full."""
+        qprompt._lines = 20
+        show_answers(test.menu, ["1", "q"], test.out, main=True, loop=True, redraw=True)
+        test.assertEqual(2, test.out.getvalue().count("-- MENU --"))
+        test.assertNotIn("\x1b[34A", test.out.getvalue())
+
+    def test_redraw_7(test):
+        """Check that echoed prompts wider than the terminal are accounted
+        for."""
+        answers = ["n", "n", "12"]
+        show_answers(test.menu, lambda _: answers.pop(0), test.out, limit=5, redraw=True, msg="x" * 90)
+        test.assertIn("\r\x1b[11A", test.out.getvalue())
+        test.assertIn("\r\x1b[12A", test.out.getvalue())
+        qprompt._columns = 20
+        test.out = TtyStream()
+        answers = ["n", "6"]
+        show_answers(test.menu, lambda _: answers.pop(0), test.out, limit=5, redraw=True)
+        test.assertIn("\r\x1b[13A", test.out.getvalue())
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
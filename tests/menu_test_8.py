@@ -0,0 +1,76 @@
+"""Tests menu entry lookup and incremental updates."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+from qprompt import Menu, MenuEntry
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.menu = Menu()
+        test.menu.add("a", "foo")
+        test.menu.add("b", "bar")
+
+    def test_menu_1(test):
+        test.assertEqual("foo", test.menu.get("a").desc)
+        test.assertEqual(None, test.menu.get("c"))
+
+    def test_menu_2(test):
+        test.menu.remove("a")
+        test.assertEqual(None, test.menu.get("a"))
+        test.assertEqual(1, len(test.menu.entries))
+        setinput("a\nb")
+        result = test.menu.show(returns="desc")
+        test.assertEqual("bar", result)
+        with test.assertRaises(KeyError):
+            test.menu.remove("a")
+
+    def test_menu_3(test):
+        test.menu.insert(0, "c", "baz")
+        test.assertEqual("c", test.menu.entries[0].name)
+        setinput("c")
+        result = test.menu.show(returns="desc")
+        test.assertEqual("baz", result)
+
+    def test_menu_4(test):
+        test.menu.update("b", desc="qux")
+        setinput("b")
+        result = test.menu.show(returns="desc")
+        test.assertEqual("qux", result)
+        test.assertEqual("qux", test.menu.entries[1].desc)
+
+    def test_menu_5(test):
+        """Check that duplicate names resolve to the first entry."""
+        test.menu.add("a", "dup")
+        test.assertEqual("foo", test.menu.get("a").desc)
+        test.menu.remove("a")
+        test.assertEqual("dup", test.menu.get("a").desc)
+        test.menu.insert(0, "a", "first")
+        test.assertEqual("first", test.menu.get("a").desc)
+
+    def test_menu_6(test):
+        """Check that directly modified entries are reindexed."""
+        test.menu.entries.append(MenuEntry("d", "direct", None, None, None))
+        test.assertEqual("direct", test.menu.get("d").desc)
+
+    def test_menu_7(test):
+        result = []
+        test.menu.add("r", "run", result.append, [1])
+        test.menu.run("r")
+        test.menu.run("x")
+        test.assertEqual([1], result)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Tests menu limit navigation."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+from qprompt import enum_menu, show_limit
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.items = ["item%u" % i for i in range(1, 101)]
+        test.menu = enum_menu(test.items)
+
+    def test_menu_1(test):
+        setinput("l\n100")
+        result = test.menu.show(limit=10, returns="desc")
+        test.assertEqual("item100", result)
+
+    def test_menu_2(test):
+        setinput("l\nf\n1")
+        result = test.menu.show(limit=10, returns="desc")
+        test.assertEqual("item1", result)
+
+    def test_menu_3(test):
+        setinput("g\n5\n45")
+        result = test.menu.show(limit=10, returns="desc")
+        test.assertEqual("item45", result)
+
+    def test_menu_4(test):
+        setinput("g\n11\n0\n2\n45")
+        with test.assertRaises(EOFError):
+            test.menu.show(limit=10)
+        setinput("g\n11\n2\n15")
+        result = test.menu.show(limit=10)
+        test.assertEqual("15", result)
+
+    def test_menu_5(test):
+        """Check that navigation names avoid clashing with entries."""
+        test.menu.add("n", "not next")
+        setinput("N\nl\nn")
+        result = show_limit(test.menu.entries, limit=10, returns="desc")
+        test.assertEqual("not next", result)
+
+    def test_menu_6(test):
+        setinput("\n\n\n")
+        result = test.menu.show(limit=10, dft=25)
+        test.assertEqual("25", result)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Benchmarks the per-call cost of a compiled Prompt against the original
+(`0.10.0`) implementation of ask()."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import timeit
+from testlib import *
+
+import qprompt
+from qprompt import Prompt, ask, cast
+
+##==============================================================#
+## SECTION: Global Definitions                                  #
+##==============================================================#
+
+#: Number of answers timed per case.
+NUMBER = 2000
+
+#: Number of times each case is repeated; the best time is reported.
+REPEAT = 5
+
+#: Valid entry lists to time; name and entries.
+CASES = [
+    ("types", [int]),
+    ("vld=10", [str(i) for i in range(10)]),
+    ("vld=1000", [str(i) for i in range(1000)]),
+    ]
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+@qprompt._format_kwargs
+def legacy_ask(msg="Enter input", fmt=None, dft=None, vld=None, shw=True, blk=False, hlp=None):
+    """The ask() function as found in `0.10.0` minus the help handling."""
+    vld = vld or []
+    hlp = hlp or ""
+    if not hasattr(vld, "__iter__"):
+        vld = [vld]
+    if not hasattr(fmt, "__call__"):
+        fmt = lambda x: x
+    msg = "%s%s" % (qprompt.QSTR, msg)
+    dft = fmt(dft) if dft != None else None
+    if dft != None:
+        msg += " [%s]" % (dft if type(dft) is str else repr(dft))
+        vld.append(dft)
+        blk = False
+    if vld:
+        vld = list(set([fmt(v) if fmt(v) else v for v in vld]))
+        if blk and "" not in vld:
+            vld.append("")
+        try: vld = sorted(vld)
+        except: pass
+    msg += qprompt.ISTR
+    ans = None
+    while ans is None:
+        ans = qprompt._input(msg)
+        if "" == ans:
+            if dft != None:
+                ans = dft if not fmt else fmt(dft)
+                break
+            if "" not in vld:
+                ans = None
+                continue
+        try:
+            ans = ans if not fmt else fmt(ans)
+        except:
+            ans = None
+        if vld:
+            for v in vld:
+                if type(v) is type and cast(ans, v) is not None:
+                    ans = cast(ans, v)
+                    break
+                elif hasattr(v, "__call__"):
+                    try:
+                        if v(ans):
+                            break
+                    except:
+                        pass
+                elif ans in vld:
+                    break
+            else:
+                ans = None
+    return ans
+
+def usec(func):
+    """Returns the best average microseconds per call of the given function."""
+    return 1e6 * min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+def run_bench():
+    """Prints the per-call cost of each implementation."""
+    qprompt._input = lambda msg: "5"
+    print("%-10s %12s %12s %12s" % ("case", "legacy us", "ask() us", "Prompt us"))
+    for name, vld in CASES:
+        prompt = Prompt(vld=vld)
+        legacy = usec(lambda: legacy_ask(vld=list(vld)))
+        current = usec(lambda: ask(vld=vld))
+        reused = usec(prompt.ask)
+        print("%-10s %12.2f %12.2f %12.2f" % (name, legacy, current, reused))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    run_bench()
@@ -0,0 +1,88 @@
+"""Tests the reusable Prompt object."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+import qprompt
+from qprompt import Prompt, ask, ask_int
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def test_prompt_1(test):
+        prompt = Prompt(vld=[int])
+        setinput("1\nfoo\n2\n3")
+        test.assertEqual(1, prompt.ask())
+        test.assertEqual(2, prompt.ask())
+        test.assertEqual(3, prompt.ask())
+
+    def test_prompt_2(test):
+        prompt = Prompt(vld=["a", "b"], dft="b")
+        test.assertEqual("a", prompt.check("a"))
+        test.assertEqual("b", prompt.check(""))
+        test.assertEqual(None, prompt.check("c"))
+        test.assertTrue(prompt.body.endswith("[b]"))
+
+    def test_prompt_3(test):
+        prompt = Prompt(vld=["a"], blk=True)
+        test.assertEqual("", prompt.check(""))
+        prompt = Prompt(vld=["a"])
+        test.assertEqual(None, prompt.check(""))
+
+    def test_prompt_4(test):
+        prompt = Prompt(vld=[lambda x: x.startswith("spa")])
+        test.assertEqual("spam", prompt.check("spam"))
+        test.assertEqual(None, prompt.check("eggs"))
+
+    def test_prompt_5(test):
+        vld = [1, 2]
+        setinput("\n")
+        ask_int(vld=vld, dft=3)
+        test.assertEqual([1, 2], vld)
+
+    def test_prompt_6(test):
+        setinput("?\nb")
+        result = ask(vld=["a", "b"], hlp="pick one")
+        test.assertEqual("b", result)
+        lines = Prompt(vld=["b", "a"], hlp="pick one")._make_help()
+        test.assertEqual("[HELP] Valid input: a | b", lines[0])
+        test.assertEqual("[HELP] Extra notes: pick one", lines[1])
+
+    def test_prompt_7(test):
+        """Check that types and functions in a set of valid entries are
+        applied rather than taken as plain values."""
+        setinput("y\n5")
+        test.assertEqual(5, ask(vld={int, "x"}))
+        test.assertEqual("x", Prompt(vld={int, "x"}).check("x"))
+        test.assertEqual("abc", Prompt(vld={str.isalpha}).check("abc"))
+        test.assertEqual(None, Prompt(vld={str.isalpha}).check("ab1"))
+        test.assertEqual("b", Prompt(vld={"a", "b"}).check("b"))
+
+    def test_prompt_8(test):
+        """Check that the prompts of the ask functions are reused only when
+        their args cannot change."""
+        test.assertIs(qprompt._int_prompt("x", 1, None, None), qprompt._int_prompt("x", 1, None, None))
+        test.assertIsNot(qprompt._int_prompt("x", 1, None, None), qprompt._int_prompt("x", 2, None, None))
+        test.assertIsNot(qprompt._prompt("x", dft=1), qprompt._prompt("x", dft=1.0))
+        test.assertIs(qprompt._prompt("x", vld=["a", int]), qprompt._prompt("x", vld=["a", int]))
+        vld = {"a"}
+        test.assertIsNot(qprompt._prompt("x", vld=vld), qprompt._prompt("x", vld=vld))
+        test.assertIsNot(qprompt._prompt("x", vld=[len]), qprompt._prompt("x", vld=[len]))
+        vld = ["a"]
+        prompt = qprompt._prompt("x", vld=vld)
+        vld.append("b")
+        test.assertEqual("b", qprompt._prompt("x", vld=vld).check("b"))
+        test.assertEqual(None, prompt.check("b"))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests the range, interval, frozenset and regex validators of prompts."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import re
+from testlib import *
+
+import qprompt
+from qprompt import Interval, Prompt, ask, ask_float, ask_int
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class CountedSet(frozenset):
+    """Frozenset that counts how many times its values are iterated."""
+    iterated = 0
+    def __iter__(self):
+        self.iterated += 1
+        return frozenset.__iter__(self)
+
+class TestCase(unittest.TestCase):
+
+    def test_vld_1(test):
+        setinput("0\n1000000\n999999")
+        test.assertEqual(999999, ask_int(vld=qprompt._range(1, 1000000)))
+        prompt = Prompt(vld=qprompt._range(10, 0, -3), fmt=int)
+        test.assertEqual([1, 4, 7, 10], [x for x in range(12) if prompt.check(str(x)) is not None])
+        test.assertEqual("[HELP] Valid input: 10..1 (step -3)\n", prompt.help_text())
+
+    def test_vld_2(test):
+        """Check that huge validators are neither expanded nor listed."""
+        vld = qprompt._range(10 ** 12)
+        prompt = Prompt(vld=[vld, -1], fmt=int)
+        test.assertEqual(10 ** 12 - 1, prompt.check(str(10 ** 12 - 1)))
+        test.assertEqual(None, prompt.check(str(10 ** 12)))
+        test.assertEqual("[HELP] Valid input: -1 | 0..999999999999\n", prompt.help_text())
+        ids = CountedSet(range(100000))
+        prompt = Prompt(vld=ids, fmt=int)
+        test.assertEqual(99999, prompt.check("99999"))
+        test.assertEqual(None, prompt.check("100000"))
+        test.assertEqual("[HELP] Valid input: <one of 100000 values>\n", Prompt(vld=ids).help_text())
+        test.assertEqual(0, ids.iterated)
+
+    def test_vld_3(test):
+        setinput("1\n-0.5\n0.25")
+        test.assertEqual(0.25, ask_float(vld=Interval(0, 1, "[)")))
+        prompt = Prompt(vld=[Interval(lo=1024), 80], fmt=int)
+        test.assertEqual(80, prompt.check("80"))
+        test.assertEqual(None, prompt.check("81"))
+        test.assertEqual(70000, prompt.check("70000"))
+        test.assertEqual("[HELP] Valid input: 80 | [1024, inf]\n", prompt.help_text())
+        test.assertNotIn("5", Interval(0, 10))
+        with test.assertRaises(ValueError):
+            Interval(0, 1, "[[")
+
+    def test_vld_4(test):
+        setinput("abc\nab12\nab1")
+        test.assertEqual("ab1", ask(vld=re.compile(r"[a-z]+\d")))
+        prompt = Prompt(vld=[re.compile("yes", re.I)])
+        test.assertEqual("YES", prompt.check("YES"))
+        test.assertEqual(None, prompt.check("yess"))
+        test.assertEqual("[HELP] Valid input: /yes/\n", prompt.help_text())
+
+    def test_vld_5(test):
+        prompt = Prompt(vld=frozenset([3, 1, 2]), fmt=int)
+        test.assertEqual(2, prompt.check("2"))
+        test.assertEqual(None, prompt.check("4"))
+        test.assertEqual(None, prompt.check("x"))
+        test.assertEqual("[HELP] Valid input: 1 | 2 | 3\n", prompt.help_text())
+
+    def test_vld_6(test):
+        """Check that NaN is outside every interval."""
+        setinput("nan\n0.5")
+        test.assertEqual(0.5, ask_float(vld=Interval(0, 1)))
+        test.assertNotIn(float("nan"), Interval(0, None))
+        test.assertNotIn(float("nan"), Interval())
+        test.assertIn(float("inf"), Interval(0, None))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+"""Benchmarks prompts, menus and rendering with scripted input at sizes from
+10 to 1M entries. Reports throughput, latency percentiles and peak memory,
+then compares the results against a JSON baseline; exits non-zero if any case
+regressed or there is no baseline. Timings depend on the machine so the
+baseline is not committed; create one with `--save` before making changes.
+
+Usage:
+  python scale_bench_1.py [--save] [--max-size N] [--case NAME] [--baseline PATH]
+"""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import argparse
+from benchlib import *
+
+import qprompt
+from qprompt import Answers, Menu, MenuEntry, NullWriter, Session
+
+##==============================================================#
+## SECTION: Global Definitions                                  #
+##==============================================================#
+
+#: Entry counts that each case is run at.
+SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+
+#: Default baseline file.
+BASELINE = op.join(op.abspath(op.dirname(__file__)), "bench_baseline.json")
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+def scripted(func, answers):
+    """Returns a function that calls the given function with the given answers
+    supplied as user input."""
+    def inner():
+        with Session(Answers(answers)):
+            return func()
+    return inner
+
+def make_entries(size):
+    """Returns a list of menu entries named `0` to `size-1`."""
+    return [MenuEntry(str(i), "Entry number %u" % i, None, [], {}) for i in range(size)]
+
+def bench_ask(size):
+    vld = [str(i) for i in range(size)]
+    return scripted(lambda: qprompt.ask(vld=vld), ["1"])
+
+def bench_ask_int(size):
+    vld = list(range(size))
+    return scripted(lambda: qprompt.ask_int(vld=vld), ["1"])
+
+def bench_show_menu(size):
+    entries = make_entries(size)
+    return scripted(lambda: qprompt.show_menu(entries), ["1"])
+
+def bench_show_limit(size):
+    entries = make_entries(size)
+    return scripted(lambda: qprompt.show_limit(entries, limit=10), ["l", "f", "1"])
+
+def bench_menu_run(size):
+    menu = Menu()
+    for i in range(size):
+        menu.add(str(i), "Entry number %u" % i, len, ["x"])
+    name = str(size - 1)
+    return lambda: menu.run(name)
+
+def bench_enum_menu(size):
+    strs = ["Entry number %u" % i for i in range(size)]
+    return lambda: qprompt.enum_menu(strs)
+
+def bench_search_index(size):
+    entries = qprompt.enum_menu(["Entry number %u" % i for i in range(size)]).entries
+    return lambda: qprompt._SearchIndex(entries)
+
+def bench_wrap(size):
+    body = "\n".join("Line number %u" % i for i in range(size))
+    return lambda: qprompt.wrap(body, hdr="bench")
+
+def bench_hrule(size):
+    return lambda: qprompt.hrule(width=size)
+
+#: Benchmark cases; name and function returning the op to time for a size.
+CASES = [
+    ("ask", bench_ask),
+    ("ask_int", bench_ask_int),
+    ("show_menu", bench_show_menu),
+    ("show_limit", bench_show_limit),
+    ("Menu.run", bench_menu_run),
+    ("enum_menu", bench_enum_menu),
+    ("search_index", bench_search_index),
+    ("wrap", bench_wrap),
+    ("hrule", bench_hrule),
+    ]
+
+def run_case(bench, size):
+    """Returns the results of the given benchmark case at the given size."""
+    func = bench(size)
+    result = measure(func)
+    result['peak_kb'] = peak_kb(func)
+    return result
+
+def print_result(key, result):
+    """Prints a row of results."""
+    name, size = key.rsplit("/", 1)
+    print("%-16s %8s %6u %12.1f %12.1f %12.1f %12.1f %10s" % (
+        name, size, result['ops'], result['ops_per_sec'],
+        result['p50_us'], result['p90_us'], result['p99_us'],
+        "-" if result['peak_kb'] is None else "%.1f" % result['peak_kb']))
+    sys.stdout.flush()
+
+def run_bench(max_size, names=None, keys=None):
+    """Runs the benchmark cases, optionally only the given `name/size` keys,
+    and prints the results as they complete. Returns a dict of results keyed
+    by `name/size`."""
+    results = {}
+    prev = qprompt.set_writer(NullWriter())
+    try:
+        print("%-16s %8s %6s %12s %12s %12s %12s %10s" % (
+            "case", "size", "ops", "ops/s", "p50 us", "p90 us", "p99 us", "peak KB"))
+        for name, bench in CASES:
+            if names and name not in names:
+                continue
+            for size in SIZES:
+                key = "%s/%u" % (name, size)
+                if size > max_size:
+                    break
+                if keys and key not in keys:
+                    continue
+                results[key] = run_case(bench, size)
+                print_result(key, results[key])
+    finally:
+        qprompt.set_writer(prev)
+    return results
+
+def main():
+    """Runs the benchmark and handles the baseline. Returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--save", action="store_true",
+            help="store the results as the new baseline")
+    parser.add_argument("--max-size", type=int, default=SIZES[-1],
+            help="largest size to run")
+    parser.add_argument("--case", action="append",
+            help="only run the named case; may be given more than once")
+    parser.add_argument("--baseline", default=BASELINE,
+            help="baseline file")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+            help="allowed relative slowdown of the median latency")
+    args = parser.parse_args()
+    baseline = load_baseline(args.baseline)
+    if baseline is None and not args.save:
+        print("[ERROR] No baseline found at `%s`; run with `--save` to create one." % (args.baseline))
+        return 1
+    results = run_bench(args.max_size, args.case)
+    if args.save:
+        if baseline:
+            baseline.update(results)
+            results = baseline
+        save_baseline(args.baseline, results)
+        print("[DONE] Baseline saved to `%s`." % (args.baseline))
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        # Timings are noisy so regressed cases are run again to confirm.
+        keys = [msg.split(":")[0] for msg in regressions]
+        print("[INFO] Running %u regressed cases again..." % (len(set(keys))))
+        again = run_bench(args.max_size, args.case, set(keys))
+        for key in again:
+            # The best median of both runs is kept, as for the repeats.
+            if again[key]['p50_us'] < results[key]['p50_us']:
+                results[key] = again[key]
+        regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("[ERROR] The following %u cases regressed:" % (len(regressions)))
+        for msg in regressions:
+            print("  " + msg)
+        return 1
+    print("[DONE] No regressions against `%s`." % (args.baseline))
+    return 0
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Tests prompting through Session objects."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import threading
+from testlib import *
+
+import qprompt
+from qprompt import Answers, Menu, Prompt, Session, StdinAuto, Writer, ask, ask_int, echo, enum_menu, pause
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+def new_session(text, **kwargs):
+    """Returns a session reading the given text with output collected in a
+    string stream available as `session.stream`."""
+    stream = StringIO()
+    session = Session(StringIO(text), Writer(stream), **kwargs)
+    session.stream = stream
+    return session
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def test_session_1(test):
+        session = new_session("foo\n42\n")
+        test.assertEqual("foo", ask(session=session))
+        test.assertEqual(42, ask_int(session=session))
+        with test.assertRaises(EOFError):
+            ask(session=session)
+        test.assertEqual("[?] Enter input: [?] Enter an integer: [?] Enter input: ", session.stream.getvalue())
+
+    def test_session_2(test):
+        session = new_session("2\n", qstr="> ", istr="? ")
+        result = enum_menu(["foo", "bar"]).show(session=session, returns="desc")
+        test.assertEqual("bar", result)
+        test.assertTrue(session.stream.getvalue().endswith("> Enter menu selection? "))
+
+    def test_session_3(test):
+        """Check that nested output follows the current session."""
+        session = new_session("e\n")
+        menu = Menu()
+        menu.add("e", "echo", echo, ["hello"])
+        with session:
+            menu.show(compact=True)
+        test.assertTrue(session.stream.getvalue().endswith("hello\n"))
+
+    def test_session_4(test):
+        session = new_session("")
+        menu = Menu()
+        menu.add("a", "foo")
+        menu.add("b", "bar")
+        result = menu.main(auto=["x", "b"], session=session)
+        test.assertEqual("b", result)
+
+    def test_session_5(test):
+        answers = iter(["bad", "7"])
+        session = Session(lambda text: next(answers), Writer(StringIO()))
+        test.assertEqual(7, Prompt(vld=[int]).ask(session))
+
+    def test_session_6(test):
+        """Check that sessions in separate threads do not interfere."""
+        results = {}
+        def run(num):
+            session = new_session("\n".join([str(num)] * 200))
+            prompt = Prompt(vld=[int])
+            results[num] = [prompt.ask(session) for _ in range(200)]
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for num in range(8):
+            test.assertEqual([num] * 200, results[num])
+
+    def test_session_7(test):
+        """Check that the prompt text follows changes to the prompt strings."""
+        session = new_session("a\nb\n")
+        prompt = Prompt()
+        test.assertEqual("a", prompt.ask(session))
+        session.istr = "> "
+        test.assertEqual("b", prompt.ask(session))
+        test.assertEqual("[?] Enter input: [?] Enter input> ", session.stream.getvalue())
+
+    def test_session_8(test):
+        """Check that pause() waits on the terminal rather than using up
+        scripted answers."""
+        paused = []
+        orig = qprompt._getpass
+        qprompt._getpass = lambda text="": paused.append(text) or ""
+        try:
+            with Session(Answers(["a"]), Writer(StringIO())):
+                pause()
+                test.assertEqual("a", ask())
+            with StdinAuto(["b"]):
+                pause()
+                test.assertEqual("b", ask())
+        finally:
+            qprompt._getpass = orig
+        test.assertEqual(2, len(paused))
+        session = new_session("\nc\n")
+        with session:
+            pause()
+            test.assertEqual("c", ask())
+        test.assertEqual(2, len(paused))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
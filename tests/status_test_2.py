@@ -0,0 +1,130 @@
+"""Tests the spinner and progress bar of the status() function."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import threading
+import time
+from testlib import *
+
+import qprompt
+from qprompt import Writer, advance, set_writer, status
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.ansi = qprompt._ansi
+        qprompt._ansi = True
+        test.stream = TtyStream()
+        test.prev = set_writer(Writer(test.stream))
+
+    def tearDown(test):
+        qprompt._ansi = test.ansi
+        set_writer(test.prev)
+
+    def frames(test):
+        return test.stream.getvalue().split("\r\x1b[2K")[1:]
+
+    def test_spin_1(test):
+        result = status("Sleeping...", time.sleep, [0.35], spin=True, rate=20)
+        test.assertEqual(None, result)
+        frames = test.frames()
+        test.assertEqual("[!] Sleeping... |", frames[0])
+        test.assertEqual("[!] Sleeping... /", frames[1])
+        test.assertEqual("[!] Sleeping... DONE.\n", frames[-1])
+        test.assertLessEqual(len(frames), 10)
+
+    def test_spin_2(test):
+        """Check that progress is shown as a bar."""
+        @status("Working...", total=4, fin="Finished.", rate=50)
+        def work(n):
+            for _ in range(n):
+                time.sleep(0.05)
+                advance()
+            return n
+        test.assertEqual(4, work(4))
+        frames = test.frames()
+        test.assertEqual("[!] Working... [....................] 0/4   0%", frames[0])
+        test.assertIn("[!] Working... [##########..........] 2/4  50%", frames)
+        test.assertEqual("[!] Finished.\n", frames[-1].replace("Working... ", ""))
+        test.assertEqual("work", work.__name__)
+        test.assertEqual((), qprompt._get_status_lines())
+
+    def test_spin_3(test):
+        """Check that the line is left open if the function fails."""
+        def fail():
+            raise ValueError()
+        with test.assertRaises(ValueError):
+            status("Failing...", fail, spin=True)
+        test.assertEqual("[!] Failing... ", test.frames()[-1])
+        test.assertEqual((), qprompt._get_status_lines())
+
+    def test_spin_4(test):
+        """Check that only the messages are shown if not a terminal."""
+        test.stream = StringIO()
+        set_writer(Writer(test.stream))
+        status("Sleeping...", time.sleep, [0.1], spin=True, total=3)
+        test.assertEqual("[!] Sleeping... DONE.\n", test.stream.getvalue())
+        advance()
+
+    def test_spin_5(test):
+        """Check that longer frames are padded before the final line break."""
+        qprompt._ansi = False
+        status("Sleeping...", time.sleep, [0.25], total=100, fin="OK", rate=20)
+        frames = test.stream.getvalue().split("\r")[1:]
+        test.assertEqual("[!] Sleeping... OK", frames[-1].rstrip(" \n"))
+        test.assertEqual(len(frames[-2]) + 1, len(frames[-1]))
+        test.assertTrue(frames[-1].endswith(" \n"))
+
+    def test_spin_6(test):
+        """Check that frames are drawn while the function has a frame open."""
+        writer = qprompt._out()
+        def work():
+            with writer:
+                writer.write("body\n")
+                time.sleep(0.3)
+        status("Working...", work, spin=True, rate=20)
+        text = test.stream.getvalue()
+        test.assertIn("body\n", text)
+        test.assertEqual(1, text.count("body"))
+        test.assertLess(text.index("[!] Working... /"), text.index("body\n"))
+
+    def test_spin_7(test):
+        """Check that advance() only affects status lines of its own thread
+        and that concurrent advances are all counted."""
+        started = threading.Event()
+        finish = threading.Event()
+        counts = []
+        def work():
+            started.set()
+            finish.wait()
+            counts.append(qprompt._get_status_lines()[-1].count)
+        other = threading.Thread(target=status, args=("Working...", work),
+            kwargs={'total': 4, 'rate': 50})
+        other.start()
+        started.wait()
+        advance()
+        test.assertEqual((), qprompt._get_status_lines())
+        finish.set()
+        other.join()
+        test.assertEqual([0], counts)
+        def spread():
+            line = qprompt._get_status_lines()[-1]
+            workers = [threading.Thread(target=line.advance, args=(1,))
+                for _ in range(8)]
+            for worker in workers: worker.start()
+            for worker in workers: worker.join()
+            return line.count
+        test.assertEqual(8, status("Working...", spread, total=8, rate=50))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Tests the progress() iterator."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import re
+import time
+from testlib import *
+
+import qprompt
+from qprompt import NullWriter, Writer, progress, set_writer
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.ansi = qprompt._ansi
+        qprompt._ansi = True
+        test.stream = TtyStream()
+        test.prev = set_writer(Writer(test.stream))
+
+    def tearDown(test):
+        qprompt._ansi = test.ansi
+        set_writer(test.prev)
+
+    def frames(test):
+        return test.stream.getvalue().split("\r\x1b[2K")[1:]
+
+    def slowly(test, n, delay=0.05):
+        for i in range(n):
+            time.sleep(delay)
+            yield i
+
+    def test_progress_1(test):
+        result = list(progress(range(4), "Counting...", rate=50))
+        test.assertEqual([0, 1, 2, 3], result)
+        frames = test.frames()
+        test.assertTrue(frames[0].startswith("[!] Counting... [....................] 0/4   0% "))
+        test.assertEqual("[!] Counting... DONE.\n", frames[-1])
+
+    def test_progress_2(test):
+        """Check that the rate and time remaining are shown."""
+        result = list(progress(test.slowly(6), "Waiting...", total=6, rate=20))
+        test.assertEqual(list(range(6)), result)
+        frames = test.frames()[1:-1]
+        test.assertTrue(frames)
+        for frame in frames:
+            test.assertTrue(re.search(r"\] [1-6]/6 +\d+% \d+\.\d/s ETA 0:00:0\d$", frame), frame)
+
+    def test_progress_3(test):
+        """Check that a spinner and count are shown if the total is unknown."""
+        list(progress(test.slowly(5), rate=20))
+        frames = test.frames()
+        test.assertEqual("[!] Working... | 0.0/s", frames[0])
+        test.assertTrue(re.search(r"^\[!\] Working\.\.\. . [1-5] \d+\.\d/s$", frames[-2]), frames[-2])
+
+    def test_progress_4(test):
+        """Check that only the message is left if iteration stops early."""
+        for i in progress(range(10), "Breaking..."):
+            if i == 3:
+                break
+        test.assertEqual("[!] Breaking... ", test.frames()[-1])
+        with test.assertRaises(ValueError):
+            for i in progress(range(10), "Failing..."):
+                raise ValueError()
+        test.assertEqual("[!] Failing... ", test.frames()[-1])
+
+    def test_progress_5(test):
+        """Check that plain lines are logged periodically if not a terminal."""
+        test.stream = StringIO()
+        set_writer(Writer(test.stream))
+        list(progress(test.slowly(6), "Logging...", total=6, every=0.1))
+        lines = test.stream.getvalue().splitlines()
+        test.assertEqual("[!] Logging... DONE.", lines[-1])
+        test.assertTrue(1 <= len(lines) - 1 <= 4)
+        for line in lines[:-1]:
+            test.assertTrue(re.search(r"^\[!\] Logging\.\.\. [1-6]/6 +\d+% \d+\.\d/s ETA 0:00:0\d$", line), line)
+
+    def test_progress_6(test):
+        """Check that the per-item cost stays small."""
+        set_writer(NullWriter())
+        items = range(200000)
+        start = time.time()
+        for _ in items:
+            pass
+        bare = time.time() - start
+        start = time.time()
+        for _ in progress(items):
+            pass
+        wrapped = time.time() - start
+        test.assertLess(wrapped - bare, 0.2)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
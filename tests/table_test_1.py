@@ -0,0 +1,110 @@
+"""Tests showing streamed rows as a table."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+import qprompt
+from qprompt import Writer, set_writer, table
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.stream = StringIO()
+        test.prev = set_writer(Writer(test.stream))
+
+    def tearDown(test):
+        set_writer(test.prev)
+
+    def lines(test):
+        return test.stream.getvalue().split("\n")[:-1]
+
+    def test_table_1(test):
+        table([("web1", "10.0.0.1"), ("db-server", 5432)], hdr=["Host", "IP"])
+        test.assertEqual([
+            "Host       IP",
+            "-------------------",
+            "web1       10.0.0.1",
+            "db-server  5432"], test.lines())
+
+    def test_table_2(test):
+        """Check that widths are estimated from the sampled rows."""
+        table([("a", 1), ("bbb", 2), ("cc", 3, "x")], sample=1, sep=" ")
+        test.assertEqual(["a 1", "bbb 2", "cc 3 x"], test.lines())
+
+    def test_table_3(test):
+        rows = StringIO("a,1\nbbb,22\r\ncc,3\n")
+        table(rows, delim=",", sample=1, exact=True)
+        test.assertEqual(["a    1", "bbb  22", "cc   3"], test.lines())
+        with test.assertRaises(TypeError):
+            table(iter([("a",)]), exact=True)
+        test.stream.truncate(0)
+        test.stream.seek(0)
+        table([("x", "y"), ("long", "z")], exact=True, sample=0)
+        test.assertEqual(["x     y", "long  z"], test.lines())
+
+    def test_table_4(test):
+        """Check that wide characters are aligned by display width."""
+        table([(u"\u6771\u4eac", 1), (u"cafe\u0301", 2), ("abcde", 3)])
+        test.assertEqual([u"\u6771\u4eac   1", u"cafe\u0301   2", "abcde  3"], test.lines())
+        test.assertEqual(2, qprompt._char_widths[u"\u6771"])
+        test.assertEqual(0, qprompt._char_widths[u"\u0301"])
+
+    def test_table_5(test):
+        """Check that rows are written as they are produced."""
+        seen = []
+        def produce():
+            for i in range(5):
+                seen.append(test.stream.getvalue().count("\n"))
+                yield ("host%u" % i, i)
+        table(produce(), sample=2)
+        test.assertEqual([0, 0, 2, 3, 4], seen)
+
+    @unittest.skipIf(not tracemalloc, "Requires tracemalloc.")
+    def test_table_6(test):
+        """Check that memory use does not grow with the number of rows."""
+        def peak(count):
+            rows = (("host-%u" % i, "10.0.%u.%u" % (i // 256 % 256, i % 256)) for i in range(count))
+            tracemalloc.start()
+            table(rows, hdr=["Host", "IP"])
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+        with open(os.devnull, "w") as fo:
+            set_writer(Writer(fo))
+            table([("warm", "up")])
+            small = peak(1000)
+            large = peak(100000)
+        test.assertLess(large, small * 2)
+
+    def test_table_7(test):
+        """Check that exact widths are refused for pipes."""
+        rfd, wfd = os.pipe()
+        os.write(wfd, b"a 1\nbb 2\n")
+        os.close(wfd)
+        with os.fdopen(rfd) as fi:
+            with test.assertRaises(TypeError):
+                table(fi, exact=True)
+
+    def test_table_8(test):
+        """Check that the header accepts the same kwarg aliases as wrap()."""
+        table([("web1", "10.0.0.1")], header=["Host", "IP"])
+        test.assertEqual("Host  IP", test.lines()[0])
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
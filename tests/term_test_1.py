@@ -0,0 +1,65 @@
+"""Tests the terminal control functions."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from testlib import *
+
+import qprompt
+from qprompt import Writer, clear, clear_line, cursor_down, cursor_up, enum_menu, move_cursor, set_writer, title
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.ansi = qprompt._ansi
+        qprompt._ansi = True
+        test.stream = TtyStream()
+        test.prev = set_writer(Writer(test.stream))
+
+    def tearDown(test):
+        qprompt._ansi = test.ansi
+        set_writer(test.prev)
+
+    def test_term_1(test):
+        clear()
+        test.assertEqual("\x1b[H\x1b[2J", test.stream.getvalue())
+
+    def test_term_2(test):
+        clear_line()
+        move_cursor(3, 4)
+        cursor_up(2)
+        cursor_down()
+        cursor_up(0)
+        test.assertEqual("\r\x1b[2K\x1b[3;4H\x1b[2A\x1b[1B", test.stream.getvalue())
+
+    @unittest.skipIf(sys.platform.startswith("win"), "title set via console API")
+    def test_term_3(test):
+        title("foo")
+        test.assertEqual("\x1b]0;foo\x07", test.stream.getvalue())
+
+    def test_term_4(test):
+        setinput("1")
+        enum_menu(["foo"]).show(clear=True)
+        test.assertTrue(test.stream.getvalue().startswith("\x1b[H\x1b[2J-- MENU --"))
+
+    def test_term_5(test):
+        """Check that no escape sequences are sent to a non-terminal."""
+        stream = StringIO()
+        set_writer(Writer(stream))
+        clear_line()
+        move_cursor(3, 4)
+        cursor_up(2)
+        title("foo")
+        test.assertEqual("\r", stream.getvalue())
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests rules and wraps sized to the terminal width."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import signal
+from testlib import *
+
+import qprompt
+from qprompt import Menu, Session, Writer, getline, hrule, set_writer, stridxrep, wrap
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.columns = qprompt._columns
+        test.expires = qprompt._size_expires
+        qprompt._size_expires = float("inf")
+        test.stream = StringIO()
+        test.prev = set_writer(Writer(test.stream))
+
+    def tearDown(test):
+        qprompt._columns = test.columns
+        qprompt._size_expires = test.expires
+        set_writer(test.prev)
+
+    def test_width_1(test):
+        test.assertEqual("=-=-=", getline("=-", 5))
+        test.assertEqual("", getline("-", 0))
+        test.assertEqual("abXd", stridxrep("abcd", 2, "X"))
+        test.assertEqual("abcd", stridxrep("abcd", 4, "X"))
+        test.assertEqual("abcd", stridxrep("abcd", -1, "X"))
+
+    def test_width_2(test):
+        qprompt._columns = 100
+        hrule()
+        qprompt._columns = 20
+        hrule()
+        hrule(width=30, char="=")
+        test.assertEqual(["-" * 65, "-" * 20, "=" * 30, ""], test.stream.getvalue().split("\n"))
+
+    def test_width_3(test):
+        qprompt._columns = 80
+        wrap("body", width=16, hdr="Title")
+        wrap("body", width=8, hdr="Long title", char="=")
+        lines = test.stream.getvalue().split("\n")
+        test.assertEqual("/-- Title ------", lines[0])
+        test.assertEqual("\\---------------", lines[2])
+        test.assertEqual("/== Long", lines[3])
+        test.assertEqual("\\=======", lines[5])
+
+    def test_width_4(test):
+        """Check that the width is detected again once it expires, without
+        handling signals."""
+        handler = signal.getsignal(signal.SIGWINCH) if hasattr(signal, "SIGWINCH") else None
+        qprompt._columns = 20
+        test.assertEqual(20, qprompt._term_width())
+        qprompt._size_expires = 0
+        test.assertNotEqual(20, qprompt._term_width())
+        test.assertTrue(qprompt._size_expires > 0)
+        if hasattr(signal, "SIGWINCH"):
+            test.assertIs(handler, signal.getsignal(signal.SIGWINCH))
+
+    def test_width_5(test):
+        """Check that redrawn menus account for wrapped lines."""
+        ansi = qprompt._ansi
+        qprompt._ansi = True
+        qprompt._columns = 20
+        try:
+            menu = Menu()
+            menu.add("1", "a description that wraps")
+            menu.add("2", "two")
+            out = TtyStream()
+            writer = Writer(out)
+            menu.show(session=Session(["3", "2"], writer), redraw=True)
+            menu.show(session=Session(["2"], writer), redraw=True)
+        finally:
+            qprompt._ansi = ansi
+        test.assertIn("\r\x1b[4A\x1b[4B\x1b[J", out.getvalue())
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
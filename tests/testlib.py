@@ -20,6 +20,29 @@ if sys.version_info >= (3, 0):
 else:
     from StringIO import StringIO
 
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TtyStream(StringIO):
+    """Stream that claims to be a terminal."""
+    def isatty(self):
+        return True
+
+##==============================================================#
+## SECTION: Function Definitions                                #
+##==============================================================#
+
+def show_answers(menu, answers, out=None, main=False, **kwargs):
+    """Shows the given menu, or runs its `main()` if `main` is true, in a
+    session reading the given answers (a list or an input function). Output
+    is written to the given stream or discarded. Returns the menu result."""
+    from qprompt import NullWriter, Session, Writer
+    session = Session(answers, NullWriter() if out is None else Writer(out))
+    if main:
+        return menu.main(session=session, **kwargs)
+    return menu.show(session=session, **kwargs)
+
 ##==============================================================#
 ## SECTION: Global Definitions                                  #
 ##==============================================================#
@@ -0,0 +1,110 @@
+"""Tests wrapping strings and streamed lines between horizontal lines."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+from io import BytesIO
+from testlib import *
+
+from qprompt import Writer, set_writer, wrap
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.stream = StringIO()
+        test.prev = set_writer(Writer(test.stream))
+
+    def tearDown(test):
+        set_writer(test.prev)
+
+    def lines(test):
+        return test.stream.getvalue().split("\n")
+
+    def test_wrap_1(test):
+        wrap("foo\nbar", width=10, hdr="Hi")
+        test.assertEqual(["/-- Hi ---", "foo", "bar", "\\---------", ""], test.lines())
+
+    def test_wrap_2(test):
+        wrap(StringIO("one\r\ntwo\n\nthree"), width=10)
+        wrap(BytesIO(b"caf\xc3\xa9\n"), width=10)
+        # Bytes lines are only decoded where they are not strings.
+        cafe = "caf\xc3\xa9" if bytes is str else u"caf\xe9"
+        test.assertEqual(["/---------", "one", "two", "", "three", "\\---------",
+            "/---------", cafe, "\\---------", ""], test.lines())
+
+    def test_wrap_3(test):
+        """Check that lines are written as they are produced."""
+        seen = []
+        def produce():
+            for i in range(3):
+                seen.append(test.stream.getvalue().count("\n"))
+                yield "line %u" % i
+        wrap(produce(), width=10)
+        test.assertEqual([1, 2, 3], seen)
+
+    def test_wrap_4(test):
+        wrap(iter(["a long line of words", "x" * 12]), width=10, soft=True)
+        wrap("a long line of words", width=10, soft=True)
+        test.assertEqual(["/---------", "a long", "line of", "words", "xxxxxxxxxx", "xx", "\\---------",
+            "/---------", "a long", "line of", "words", "\\---------", ""], test.lines())
+
+    @unittest.skipIf(not tracemalloc, "Requires tracemalloc.")
+    def test_wrap_5(test):
+        """Check that memory use does not grow with the body."""
+        def peak(count):
+            body = ("line %u of the log" % i for i in range(count))
+            tracemalloc.start()
+            wrap(body, soft=True)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+        with open(os.devnull, "w") as fo:
+            set_writer(Writer(fo))
+            wrap(iter(["warm up"]), soft=True)
+            small = peak(1000)
+            large = peak(100000)
+        test.assertLess(large, small * 2)
+
+    def test_wrap_6(test):
+        """Check that a bytes body is shown as a single value."""
+        wrap(b"hello", width=10)
+        test.assertEqual(["/---------", "%s" % (b"hello",), "\\---------", ""], test.lines())
+
+    def test_wrap_7(test):
+        """Check that lists are shown as is and other lines as strings."""
+        wrap([1, 2, 3], width=10)
+        wrap((x for x in range(2)), width=10)
+        test.assertEqual(["/---------", "[1, 2, 3]", "\\---------",
+            "/---------", "0", "1", "\\---------", ""], test.lines())
+
+    def test_wrap_8(test):
+        """Check that lines of sources that may wait are flushed at once
+        while lines of files are flushed in batches."""
+        flushed = []
+        class Flushed(StringIO):
+            def flush(self):
+                flushed.append(self.getvalue().count("\n"))
+        set_writer(Writer(Flushed()))
+        wrap(iter(["a", "b"]), width=10)
+        test.assertEqual([1, 2, 3, 4], flushed)
+        del flushed[:]
+        set_writer(Writer(Flushed()))
+        wrap(StringIO("a\nb\n"), width=10)
+        test.assertEqual([1, 4], flushed)
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()
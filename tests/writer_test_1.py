@@ -0,0 +1,107 @@
+"""Tests the output writers."""
+
+##==============================================================#
+## SECTION: Imports                                             #
+##==============================================================#
+
+import threading
+from testlib import *
+
+import qprompt
+from qprompt import NullWriter, Session, Writer, alert, echo, enum_menu, set_writer, wrap
+
+##==============================================================#
+## SECTION: Class Definitions                                   #
+##==============================================================#
+
+class CountingStream(StringIO):
+    """Stream that counts the number of write and flush calls."""
+    def __init__(self):
+        StringIO.__init__(self)
+        self.writes = 0
+        self.flushes = 0
+    def write(self, text):
+        self.writes += 1
+        return StringIO.write(self, text)
+    def flush(self):
+        self.flushes += 1
+
+class TestCase(unittest.TestCase):
+
+    def setUp(test):
+        test.stream = CountingStream()
+        test.prev = set_writer(Writer(test.stream))
+
+    def tearDown(test):
+        set_writer(test.prev)
+
+    def test_writer_1(test):
+        echo("foo")
+        echo("bar", "baz", sep="-", end="!")
+        alert("qux")
+        test.assertEqual("foo\nbar-baz![!] qux\n", test.stream.getvalue())
+
+    def test_writer_2(test):
+        menu = enum_menu(["item%u" % i for i in range(100)])
+        setinput("1")
+        menu.show(note="hi")
+        lines = test.stream.getvalue().splitlines()
+        test.assertEqual("-- MENU --", lines[0])
+        test.assertEqual("  (100) item99", lines[100])
+        test.assertEqual("[!] hi", lines[101])
+        test.assertTrue(lines[102].startswith("[?] Enter menu selection"))
+        test.assertEqual(2, test.stream.writes)
+        test.assertEqual(2, test.stream.flushes)
+
+    def test_writer_3(test):
+        with Writer(test.stream) as writer:
+            writer.write("foo")
+            with writer:
+                writer.write("bar")
+            test.assertEqual(0, test.stream.writes)
+        test.assertEqual("foobar", test.stream.getvalue())
+        test.assertEqual(1, test.stream.writes)
+
+    def test_writer_4(test):
+        set_writer(NullWriter())
+        echo("foo")
+        wrap("bar")
+        setinput("1")
+        result = enum_menu(["foo", "bar"]).show()
+        test.assertEqual("1", result)
+        test.assertEqual("", test.stream.getvalue())
+
+    def test_writer_5(test):
+        """Check that a frame open in one thread does not hold back the
+        output of another thread sharing the writer."""
+        opened = threading.Event()
+        done = threading.Event()
+        shown = []
+        def hold():
+            with qprompt._out():
+                echo("held")
+                opened.set()
+                done.wait(5)
+        def reader(text):
+            shown.append(test.stream.getvalue())
+            return "1"
+        thread = threading.Thread(target=hold)
+        thread.start()
+        opened.wait(5)
+        try:
+            result = enum_menu(["foo"]).show(session=Session(reader))
+        finally:
+            done.set()
+            thread.join()
+        test.assertEqual("1", result)
+        test.assertIn("-- MENU --", shown[0])
+        test.assertTrue(shown[0].endswith("[?] Enter menu selection: "))
+        test.assertNotIn("held", shown[0])
+        test.assertTrue(test.stream.getvalue().endswith("held\n"))
+
+##==============================================================#
+## SECTION: Main Body                                           #
+##==============================================================#
+
+if __name__ == '__main__':
+    unittest.main()